@@ -0,0 +1,111 @@
+"""booking overlap exclusion constraint
+
+Existing double bookings are resolved before the constraint is added: for
+every staff member the earliest-created blocking booking in an overlapping
+group is kept and each later one that still overlaps a kept booking is moved
+to ``no_show`` (the only non-blocking status at this revision). Every moved
+booking is recorded in ``booking_overlap_resolutions`` with the booking it lost
+to and its previous status, and the ids are logged, so staff can contact the
+client or refund. Downgrade restores the previous statuses.
+
+Writes to ``bookings`` are blocked while conflicts are resolved and the gist
+index is built under ACCESS EXCLUSIVE (exclusion constraints cannot be added
+concurrently or NOT VALID); ``lock_timeout`` makes the migration fail fast
+instead of queueing traffic behind it, so run it in a quiet period.
+
+Revision ID: 0002_booking_no_overlap
+Revises: 0001_initial
+Create Date: 2026-10-17
+"""
+
+import logging
+
+import sqlalchemy as sa
+from alembic import context, op
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0002_booking_no_overlap"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+BLOCKING = "('pending', 'confirmed', 'paid', 'completed')"
+OVERLAPS = "tstzrange({0}.start_at, {0}.end_at, '[)') && tstzrange({1}.start_at, {1}.end_at, '[)')"
+LATER_OVERLAPS = OVERLAPS.format("earlier", "later")
+PRIOR_OVERLAPS = OVERLAPS.format("prior", "earlier")
+
+RESOLVE_OVERLAPS = f"""
+DO $$
+DECLARE
+    moved integer;
+BEGIN
+    LOOP
+        WITH conflicts AS (
+            SELECT DISTINCT ON (later.id) later.id AS booking_id, earlier.id AS kept_booking_id, later.status
+            FROM bookings AS later
+            JOIN bookings AS earlier
+                ON earlier.staff_id = later.staff_id AND earlier.id < later.id AND {LATER_OVERLAPS}
+            WHERE later.status IN {BLOCKING}
+                AND earlier.status IN {BLOCKING}
+                AND NOT EXISTS (
+                    SELECT 1 FROM bookings AS prior
+                    WHERE prior.staff_id = earlier.staff_id
+                        AND prior.id < earlier.id
+                        AND prior.status IN {BLOCKING}
+                        AND {PRIOR_OVERLAPS}
+                )
+            ORDER BY later.id, earlier.id
+        ), recorded AS (
+            INSERT INTO booking_overlap_resolutions (booking_id, kept_booking_id, previous_status)
+            SELECT * FROM conflicts
+            RETURNING booking_id
+        )
+        UPDATE bookings SET status = 'no_show' WHERE id IN (SELECT booking_id FROM recorded);
+        GET DIAGNOSTICS moved = ROW_COUNT;
+        EXIT WHEN moved = 0;
+    END LOOP;
+END $$
+"""
+
+
+def upgrade() -> None:
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.create_table(
+        "booking_overlap_resolutions",
+        sa.Column("booking_id", sa.Integer(), sa.ForeignKey("bookings.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("kept_booking_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "previous_status",
+            postgresql.ENUM(name="bookingstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("resolved_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.execute("LOCK TABLE bookings IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(RESOLVE_OVERLAPS)
+    if not context.is_offline_mode():
+        resolutions = op.get_bind().execute(
+            sa.text("SELECT booking_id, kept_booking_id, previous_status FROM booking_overlap_resolutions ORDER BY 1")
+        )
+        for booking_id, kept_booking_id, previous_status in resolutions:
+            logger.warning(
+                "Booking %s (%s) overlaps booking %s; moved to no_show", booking_id, previous_status, kept_booking_id
+            )
+    op.execute(
+        "ALTER TABLE bookings ADD CONSTRAINT ex_bookings_staff_no_overlap "
+        "EXCLUDE USING gist (staff_id WITH =, tstzrange(start_at, end_at, '[)') WITH &&) "
+        f"WHERE (status IN {BLOCKING})"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE bookings DROP CONSTRAINT IF EXISTS ex_bookings_staff_no_overlap")
+    op.execute(
+        "UPDATE bookings SET status = resolutions.previous_status "
+        "FROM booking_overlap_resolutions AS resolutions WHERE bookings.id = resolutions.booking_id"
+    )
+    op.drop_table("booking_overlap_resolutions")
@@ -0,0 +1,47 @@
+"""composite and partial indexes for slot and conflict queries
+
+Revision ID: 0003_slot_query_indexes
+Revises: 0002_booking_no_overlap
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_slot_query_indexes"
+down_revision = "0002_booking_no_overlap"
+branch_labels = None
+depends_on = None
+
+
+BLOCKING_STATUS_SQL = "status IN ('pending', 'confirmed', 'paid', 'completed')"
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_bookings_staff_id_end_at_blocking",
+            "bookings",
+            ["staff_id", "end_at"],
+            postgresql_include=["start_at"],
+            postgresql_where=sa.text(BLOCKING_STATUS_SQL),
+            postgresql_concurrently=True,
+        )
+        op.create_index("ix_schedules_staff_id_day", "schedules", ["staff_id", "day"], postgresql_concurrently=True)
+
+        op.drop_index("ix_bookings_start_at", table_name="bookings", postgresql_concurrently=True)
+        op.drop_index("ix_bookings_end_at", table_name="bookings", postgresql_concurrently=True)
+        op.drop_index("ix_schedules_staff_id", table_name="schedules", postgresql_concurrently=True)
+        op.drop_index("ix_schedules_day", table_name="schedules", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index("ix_schedules_day", "schedules", ["day"], postgresql_concurrently=True)
+        op.create_index("ix_schedules_staff_id", "schedules", ["staff_id"], postgresql_concurrently=True)
+        op.create_index("ix_bookings_end_at", "bookings", ["end_at"], postgresql_concurrently=True)
+        op.create_index("ix_bookings_start_at", "bookings", ["start_at"], postgresql_concurrently=True)
+
+        op.drop_index("ix_schedules_staff_id_day", table_name="schedules", postgresql_concurrently=True)
+        op.drop_index("ix_bookings_staff_id_end_at_blocking", table_name="bookings", postgresql_concurrently=True)
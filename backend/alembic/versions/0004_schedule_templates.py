@@ -0,0 +1,41 @@
+"""recurring weekly schedule templates
+
+Revision ID: 0004_schedule_templates
+Revises: 0003_slot_query_indexes
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0004_schedule_templates"
+down_revision = "0003_slot_query_indexes"
+branch_labels = None
+depends_on = None
+
+
+schedule_type = postgresql.ENUM("work", "day_off", "break", name="scheduletype", create_type=False)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "schedule_templates",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("staff_id", sa.Integer(), sa.ForeignKey("staff.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("weekday", sa.SmallInteger(), nullable=False),
+        sa.Column("schedule_type", schedule_type, nullable=False),
+        sa.Column("start_time", sa.Time(), nullable=False),
+        sa.Column("end_time", sa.Time(), nullable=False),
+        sa.Column("valid_from", sa.Date(), nullable=False),
+        sa.Column("valid_until", sa.Date(), nullable=True),
+        sa.CheckConstraint("end_time > start_time", name="ck_schedule_template_time_order"),
+        sa.CheckConstraint("weekday BETWEEN 0 AND 6", name="ck_schedule_template_weekday"),
+    )
+    op.create_index("ix_schedule_templates_staff_id_weekday", "schedule_templates", ["staff_id", "weekday"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_schedule_templates_staff_id_weekday", table_name="schedule_templates")
+    op.drop_table("schedule_templates")
@@ -0,0 +1,85 @@
+"""unique external payment id for idempotent webhook upserts
+
+Duplicate transactions for the same external payment id (replayed webhooks)
+are copied to ``transactions_duplicate_archive`` together with the id of the
+kept (earliest) row and logged before they are deleted; downgrade restores them.
+
+Revision ID: 0005_unique_external_payment_id
+Revises: 0004_schedule_templates
+Create Date: 2026-10-17
+"""
+
+import logging
+
+import sqlalchemy as sa
+from alembic import context, op
+
+
+revision = "0005_unique_external_payment_id"
+down_revision = "0004_schedule_templates"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+TRANSACTION_COLUMNS = "id, booking_id, amount, transaction_type, payment_method, external_payment_id, created_at"
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE transactions_duplicate_archive AS
+        WITH kept AS (
+            SELECT external_payment_id, min(id) AS kept_transaction_id
+            FROM transactions
+            WHERE external_payment_id IS NOT NULL
+            GROUP BY external_payment_id
+            HAVING count(*) > 1
+        )
+        SELECT duplicate.*, kept.kept_transaction_id, now() AS archived_at
+        FROM transactions AS duplicate
+        JOIN kept ON kept.external_payment_id = duplicate.external_payment_id
+        WHERE duplicate.id <> kept.kept_transaction_id
+        """
+    )
+    if not context.is_offline_mode():
+        archived = op.get_bind().execute(
+            sa.text(
+                "SELECT id, kept_transaction_id, external_payment_id FROM transactions_duplicate_archive ORDER BY id"
+            )
+        )
+        for transaction_id, kept_transaction_id, external_payment_id in archived:
+            logger.warning(
+                "Archiving duplicate transaction %s for payment %s (kept %s)",
+                transaction_id,
+                external_payment_id,
+                kept_transaction_id,
+            )
+    op.execute("DELETE FROM transactions WHERE id IN (SELECT id FROM transactions_duplicate_archive)")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_external_payment_id_unique",
+            "transactions",
+            ["external_payment_id"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_transactions_external_payment_id", table_name="transactions", postgresql_concurrently=True)
+    op.execute("ALTER INDEX ix_transactions_external_payment_id_unique RENAME TO ix_transactions_external_payment_id")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_external_payment_id_plain",
+            "transactions",
+            ["external_payment_id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_transactions_external_payment_id", table_name="transactions", postgresql_concurrently=True)
+    op.execute("ALTER INDEX ix_transactions_external_payment_id_plain RENAME TO ix_transactions_external_payment_id")
+    op.execute(
+        f"INSERT INTO transactions ({TRANSACTION_COLUMNS}) "
+        f"SELECT {TRANSACTION_COLUMNS} FROM transactions_duplicate_archive"
+    )
+    op.drop_table("transactions_duplicate_archive")
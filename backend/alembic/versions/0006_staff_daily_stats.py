@@ -0,0 +1,38 @@
+"""per-staff daily analytics rollups
+
+Revision ID: 0006_staff_daily_stats
+Revises: 0005_unique_external_payment_id
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_staff_daily_stats"
+down_revision = "0005_unique_external_payment_id"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "staff_daily_stats",
+        sa.Column("staff_id", sa.Integer(), sa.ForeignKey("staff.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("business_id", sa.Integer(), sa.ForeignKey("businesses.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("work_minutes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("booked_minutes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("bookings_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("completed_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("no_show_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("booked_value", sa.Numeric(12, 2), nullable=False, server_default="0"),
+        sa.Column("revenue", sa.Numeric(12, 2), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.create_index("ix_staff_daily_stats_business_id_day", "staff_daily_stats", ["business_id", "day"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_staff_daily_stats_business_id_day", table_name="staff_daily_stats")
+    op.drop_table("staff_daily_stats")
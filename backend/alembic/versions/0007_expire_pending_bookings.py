@@ -0,0 +1,32 @@
+"""expired booking status and pending sweep index
+
+Revision ID: 0007_expire_pending_bookings
+Revises: 0006_staff_daily_stats
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_expire_pending_bookings"
+down_revision = "0006_staff_daily_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE bookingstatus ADD VALUE IF NOT EXISTS 'expired'")
+        op.create_index(
+            "ix_bookings_status_created_at_pending",
+            "bookings",
+            ["status", "created_at"],
+            postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_bookings_status_created_at_pending", table_name="bookings", postgresql_concurrently=True)
@@ -0,0 +1,47 @@
+"""booking notification delivery markers
+
+Revision ID: 0008_booking_notifications
+Revises: 0007_expire_pending_bookings
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_booking_notifications"
+down_revision = "0007_expire_pending_bookings"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("bookings", sa.Column("confirmation_sent_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("bookings", sa.Column("reminder_sent_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        "UPDATE bookings SET confirmation_sent_at = now() "
+        "WHERE start_at > now() AND status IN ('confirmed', 'paid')"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_bookings_start_at_unconfirmed",
+            "bookings",
+            ["start_at"],
+            postgresql_where=sa.text("confirmation_sent_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_bookings_start_at_unreminded",
+            "bookings",
+            ["start_at"],
+            postgresql_where=sa.text("reminder_sent_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_bookings_start_at_unreminded", table_name="bookings", postgresql_concurrently=True)
+        op.drop_index("ix_bookings_start_at_unconfirmed", table_name="bookings", postgresql_concurrently=True)
+    op.drop_column("bookings", "reminder_sent_at")
+    op.drop_column("bookings", "confirmation_sent_at")
@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from fastapi import Depends, Header, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.core.config import settings
+from app.core.security import TokenPayload, create_access_token, validate_telegram_init_data, verify_access_token
+from app.schemas.auth import TokenOut
+
+TELEGRAM_SCOPE = "telegram"
+
+bearer_scheme = HTTPBearer()
+
+
+async def get_token_payload(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)) -> TokenPayload:
+    return verify_access_token(credentials.credentials)
+
+
+async def get_staff_token_payload(payload: TokenPayload = Depends(get_token_payload)) -> TokenPayload:
+    if payload.get("scope") == TELEGRAM_SCOPE:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Staff credentials required")
+    return payload
+
+
+async def get_telegram_init_data(x_telegram_init_data: str = Header()) -> dict:
+    return validate_telegram_init_data(x_telegram_init_data)
+
+
+async def issue_telegram_session_token(init_data: dict = Depends(get_telegram_init_data)) -> TokenOut:
+    user_id = init_data["user"].get("id")
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Telegram user payload invalid")
+
+    expires_in = timedelta(minutes=settings.telegram_session_token_expire_minutes)
+    token = create_access_token(f"tg:{user_id}", expires_in, claims={"scope": TELEGRAM_SCOPE})
+    return TokenOut(access_token=token, expires_in=int(expires_in.total_seconds()))
@@ -0,0 +1,84 @@
+from datetime import date, datetime, time, timedelta
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from app.schemas.booking import SlotFormat
+from app.services.intervals import Interval
+from app.services.slot_finder import ChainLink
+
+MINUTE = timedelta(minutes=1)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+def _midnight(day: date, tz: ZoneInfo) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=tz)
+
+
+def _offsets(midnight: datetime, slots) -> list[int]:
+    if midnight.utcoffset() == (midnight + timedelta(days=1)).utcoffset():
+        return [(slot[0] - midnight) // MINUTE for slot in slots]
+    base = midnight.timestamp()
+    return [int(slot[0].timestamp() - base) // 60 for slot in slots]
+
+
+def _duration_minutes(slots) -> int:
+    return (slots[0][1] - slots[0][0]) // MINUTE if slots else 0
+
+
+def day_slots_payload(day: date, slots: list[Interval], fmt: SlotFormat, tz: ZoneInfo) -> dict:
+    if fmt == SlotFormat.compact:
+        midnight = _midnight(day, tz)
+        return {
+            "day": day,
+            "midnight": midnight,
+            "duration_minutes": _duration_minutes(slots),
+            "offsets": _offsets(midnight, slots),
+        }
+    return {"day": day, "slots": [{"start_at": start, "end_at": end} for start, end in slots]}
+
+
+def day_staff_slots_payload(
+    day: date, slots: list[tuple[datetime, datetime, list[int]]], fmt: SlotFormat, tz: ZoneInfo
+) -> dict:
+    if fmt == SlotFormat.compact:
+        midnight = _midnight(day, tz)
+        return {
+            "day": day,
+            "midnight": midnight,
+            "duration_minutes": _duration_minutes(slots),
+            "offsets": _offsets(midnight, slots),
+            "staff_ids": [staff_ids for _, _, staff_ids in slots],
+        }
+    return {
+        "day": day,
+        "slots": [{"start_at": start, "end_at": end, "staff_ids": staff_ids} for start, end, staff_ids in slots],
+    }
+
+
+def day_chains_payload(day: date, chains: list[list[ChainLink]]) -> dict:
+    return {
+        "day": day,
+        "chains": [
+            {
+                "start_at": chain[0].start_at,
+                "end_at": chain[-1].end_at,
+                "links": [
+                    {
+                        "start_at": link.start_at,
+                        "end_at": link.end_at,
+                        "staff_ids": list(link.staff_ids),
+                        "service_id": link.service_id,
+                    }
+                    for link in chain
+                ],
+            }
+            for chain in chains
+        ],
+    }
@@ -0,0 +1,124 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_staff_token_payload
+from app.db.session import get_db
+from app.models import Business, Service, Staff
+from app.schemas.analytics import DashboardOut, DashboardQuery
+from app.schemas.bulk import BookingExportQuery, BulkFormat, BulkKind, ImportReport
+from app.schemas.business import BusinessOut, BusinessUpdate, ServiceOut, ServiceUpdate
+from app.services import availability_events, reference_cache, slot_cache
+from app.services.accounting_export import export_bookings
+from app.services.analytics import load_dashboard
+from app.services.bulk_io import export_rows, import_rows, iter_records
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(get_staff_token_payload)])
+
+MEDIA_TYPES = {BulkFormat.csv: "text/csv", BulkFormat.jsonl: "application/x-ndjson"}
+
+
+async def _ensure_business(db: AsyncSession, business_id: int) -> reference_cache.BusinessInfo:
+    business = await reference_cache.get_business(db, business_id)
+    if not business:
+        raise HTTPException(status_code=404, detail="Business not found")
+    return business
+
+
+async def _invalidate_business_slots(db: AsyncSession, business_id: int) -> None:
+    for staff_id in (await db.scalars(select(Staff.id).where(Staff.business_id == business_id))).all():
+        await slot_cache.invalidate_staff(business_id, staff_id)
+
+
+@router.patch("/businesses/{business_id}", response_model=BusinessOut)
+async def update_business(business_id: int, payload: BusinessUpdate, db: AsyncSession = Depends(get_db)) -> BusinessOut:
+    business = await db.get(Business, business_id)
+    if not business:
+        raise HTTPException(status_code=404, detail="Business not found")
+    changes = payload.model_dump(exclude_unset=True, exclude_none=True)
+    timezone_changed = changes.get("timezone", business.timezone) != business.timezone
+    for field, value in changes.items():
+        setattr(business, field, value)
+    await db.commit()
+
+    await availability_events.publish_reference_change("business", business_id)
+    if timezone_changed:
+        await _invalidate_business_slots(db, business_id)
+    return BusinessOut.model_validate(business)
+
+
+@router.patch("/businesses/{business_id}/services/{service_id}", response_model=ServiceOut)
+async def update_service(
+    business_id: int,
+    service_id: int,
+    payload: ServiceUpdate,
+    db: AsyncSession = Depends(get_db),
+) -> ServiceOut:
+    service = await db.get(Service, service_id)
+    if not service or service.business_id != business_id:
+        raise HTTPException(status_code=404, detail="Service not found")
+    changes = payload.model_dump(exclude_unset=True, exclude_none=True)
+    duration_changed = changes.get("duration_minutes", service.duration_minutes) != service.duration_minutes
+    for field, value in changes.items():
+        setattr(service, field, value)
+    await db.commit()
+
+    await availability_events.publish_reference_change("service", service_id)
+    if duration_changed:
+        await _invalidate_business_slots(db, business_id)
+    return ServiceOut.model_validate(service)
+
+
+@router.get("/businesses/{business_id}/dashboard", response_model=DashboardOut)
+async def dashboard(
+    business_id: int,
+    query: Annotated[DashboardQuery, Query()],
+    db: AsyncSession = Depends(get_db),
+) -> DashboardOut:
+    await _ensure_business(db, business_id)
+    return await load_dashboard(db, business_id, query)
+
+
+@router.post("/businesses/{business_id}/import/{kind}", response_model=ImportReport)
+async def bulk_import(
+    business_id: int,
+    kind: BulkKind,
+    request: Request,
+    fmt: BulkFormat = Query(default=BulkFormat.csv, alias="format"),
+    db: AsyncSession = Depends(get_db),
+) -> ImportReport:
+    await _ensure_business(db, business_id)
+    return await import_rows(db, business_id, kind, iter_records(request.stream(), fmt))
+
+
+@router.get("/businesses/{business_id}/export/bookings")
+async def bookings_export(
+    business_id: int,
+    query: Annotated[BookingExportQuery, Query()],
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    business = await _ensure_business(db, business_id)
+    filename = f"bookings-{business_id}-{query.date_from}-{query.date_to}.{query.format}"
+    return StreamingResponse(
+        export_bookings(business_id, query, business.timezone),
+        media_type=MEDIA_TYPES[query.format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/businesses/{business_id}/export/{kind}")
+async def bulk_export(
+    business_id: int,
+    kind: BulkKind,
+    fmt: BulkFormat = Query(default=BulkFormat.csv, alias="format"),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    await _ensure_business(db, business_id)
+    return StreamingResponse(
+        export_rows(business_id, kind, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{kind}-{business_id}.{fmt}"'},
+    )
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+
+from app.api.deps import issue_telegram_session_token
+from app.schemas.auth import TokenOut
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+@router.post("/telegram", response_model=TokenOut)
+async def telegram_login(token: TokenOut = Depends(issue_telegram_session_token)) -> TokenOut:
+    return token
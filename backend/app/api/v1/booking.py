@@ -1,19 +1,55 @@
-from datetime import timedelta
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Annotated
+from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import and_, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from redis.exceptions import RedisError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.responses import FastJSONResponse, day_chains_payload, day_slots_payload, day_staff_slots_payload
+from app.core.metrics import BOOKING_CONFLICTS
 from app.db.session import get_db
-from app.models import Booking, BookingSource, BookingStatus, Service
-from app.schemas.booking import BookingCreate, BookingOut, SlotOut, SlotQuery
-from app.services.slot_finder import find_free_slots
+from app.models import BOOKING_OVERLAP_CONSTRAINT, Booking, BookingSource, BookingStatus
+from app.schemas.booking import (
+    AnyStaffSlotQuery,
+    BookingCreate,
+    BookingOut,
+    ChainBookingCreate,
+    ChainSlotQuery,
+    CompactDaySlotsOut,
+    CompactDayStaffSlotsOut,
+    DayChainSlotsOut,
+    DaySlotsOut,
+    DayStaffSlotsOut,
+    SlotFormat,
+    SlotHoldCreate,
+    SlotHoldOut,
+    SlotOut,
+    SlotQuery,
+    SlotRangeQuery,
+)
+from app.services import availability_events, reference_cache, slot_cache, slot_holds
+from app.services.slot_finder import (
+    find_free_slots,
+    find_free_slots_any_staff,
+    find_free_slots_range,
+    find_slot_chains,
+)
+from app.services.slot_stream import stream_slot_updates
 
 router = APIRouter(prefix="/booking", tags=["booking"])
 
 
-@router.post("/slots", response_model=list[SlotOut])
-async def list_slots(payload: SlotQuery, db: AsyncSession = Depends(get_db)) -> list[SlotOut]:
+async def _business_timezone(db: AsyncSession, business_id: int) -> ZoneInfo:
+    business = await reference_cache.get_business(db, business_id)
+    return business.timezone if business else reference_cache.get_zoneinfo("UTC")
+
+
+@router.post("/slots", response_model=list[SlotOut] | CompactDaySlotsOut)
+async def list_slots(payload: SlotQuery, db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
     slots = await find_free_slots(
         db=db,
         business_id=payload.business_id,
@@ -22,31 +58,89 @@ async def list_slots(payload: SlotQuery, db: AsyncSession = Depends(get_db)) ->
         day=payload.day,
         step_minutes=payload.step_minutes,
     )
-    return [SlotOut(start_at=start, end_at=end) for start, end in slots]
+    if payload.format == SlotFormat.compact:
+        tz = await _business_timezone(db, payload.business_id)
+        return FastJSONResponse(day_slots_payload(payload.day, slots, payload.format, tz))
+    return FastJSONResponse([{"start_at": start, "end_at": end} for start, end in slots])
+
+
+@router.post("/slots/range", response_model=list[DaySlotsOut] | list[CompactDaySlotsOut])
+async def list_slots_range(payload: SlotRangeQuery, db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
+    slots_by_day = await find_free_slots_range(
+        db=db,
+        business_id=payload.business_id,
+        service_id=payload.service_id,
+        staff_id=payload.staff_id,
+        date_from=payload.date_from,
+        date_to=payload.date_to,
+        step_minutes=payload.step_minutes,
+    )
+    tz = await _business_timezone(db, payload.business_id)
+    return FastJSONResponse([day_slots_payload(day, slots, payload.format, tz) for day, slots in slots_by_day.items()])
+
+
+@router.get("/slots/stream")
+async def stream_slots(query: Annotated[SlotRangeQuery, Query()]) -> StreamingResponse:
+    return StreamingResponse(
+        stream_slot_updates(query),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/slots/any", response_model=list[DayStaffSlotsOut] | list[CompactDayStaffSlotsOut])
+async def list_slots_any_staff(payload: AnyStaffSlotQuery, db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
+    slots_by_day = await find_free_slots_any_staff(
+        db=db,
+        business_id=payload.business_id,
+        service_id=payload.service_id,
+        date_from=payload.date_from,
+        date_to=payload.date_to,
+        step_minutes=payload.step_minutes,
+    )
+    tz = await _business_timezone(db, payload.business_id)
+    return FastJSONResponse(
+        [day_staff_slots_payload(day, slots, payload.format, tz) for day, slots in slots_by_day.items()]
+    )
+
+
+@router.post("/slots/chain", response_model=list[DayChainSlotsOut])
+async def list_slot_chains(payload: ChainSlotQuery, db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
+    chains_by_day = await find_slot_chains(
+        db=db,
+        business_id=payload.business_id,
+        steps=[(step.service_id, step.staff_id) for step in payload.steps],
+        date_from=payload.date_from,
+        date_to=payload.date_to,
+        step_minutes=payload.step_minutes,
+    )
+    return FastJSONResponse([day_chains_payload(day, chains) for day, chains in chains_by_day.items()])
+
+
+async def _commit_bookings(db: AsyncSession, bookings: list[Booking]) -> None:
+    db.add_all(bookings)
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        if BOOKING_OVERLAP_CONSTRAINT in str(exc.orig):
+            BOOKING_CONFLICTS.inc()
+            raise HTTPException(status_code=409, detail="Timeslot is no longer available") from exc
+        raise
 
 
 @router.post("", response_model=BookingOut, status_code=status.HTTP_201_CREATED)
 async def create_booking(payload: BookingCreate, db: AsyncSession = Depends(get_db)) -> BookingOut:
-    service = await db.scalar(
-        select(Service).where(and_(Service.id == payload.service_id, Service.business_id == payload.business_id, Service.is_active))
-    )
-    if not service:
+    service = await reference_cache.get_service(db, payload.business_id, payload.service_id)
+    if not service or not service.is_active:
         raise HTTPException(status_code=404, detail="Service not found")
+    business = await reference_cache.get_business(db, payload.business_id)
 
     end_at = payload.start_at + timedelta(minutes=service.duration_minutes)
 
-    conflict = await db.scalar(
-        select(Booking).where(
-            and_(
-                Booking.staff_id == payload.staff_id,
-                Booking.start_at < end_at,
-                Booking.end_at > payload.start_at,
-                Booking.status.in_([BookingStatus.pending, BookingStatus.confirmed, BookingStatus.paid]),
-            )
-        )
-    )
-    if conflict:
-        raise HTTPException(status_code=409, detail="Timeslot is no longer available")
+    if not await slot_holds.check(payload.business_id, payload.staff_id, payload.start_at, end_at, payload.hold_token):
+        BOOKING_CONFLICTS.inc()
+        raise HTTPException(status_code=409, detail="Timeslot is held by another client")
 
     booking = Booking(
         business_id=payload.business_id,
@@ -60,7 +154,98 @@ async def create_booking(payload: BookingCreate, db: AsyncSession = Depends(get_
         notes=payload.notes,
         total_price=service.price,
     )
-    db.add(booking)
-    await db.commit()
+    await _commit_bookings(db, [booking])
+    await slot_holds.consume(payload.business_id, payload.staff_id, payload.hold_token)
     await db.refresh(booking)
+    await slot_cache.invalidate_booking(booking.business_id, booking.staff_id, booking.start_at, booking.end_at, business.timezone)
     return BookingOut.model_validate(booking)
+
+
+@router.post("/chain", response_model=list[BookingOut], status_code=status.HTTP_201_CREATED)
+async def create_booking_chain(payload: ChainBookingCreate, db: AsyncSession = Depends(get_db)) -> list[BookingOut]:
+    business = await reference_cache.get_business(db, payload.business_id)
+    bookings: list[Booking] = []
+    start_at = payload.start_at
+    for step in payload.steps:
+        service = await reference_cache.get_service(db, payload.business_id, step.service_id)
+        if not service or not service.is_active:
+            raise HTTPException(status_code=404, detail="Service not found")
+        end_at = start_at + timedelta(minutes=service.duration_minutes)
+        bookings.append(
+            Booking(
+                business_id=payload.business_id,
+                service_id=step.service_id,
+                staff_id=step.staff_id,
+                client_id=payload.client_id,
+                start_at=start_at,
+                end_at=end_at,
+                status=BookingStatus.pending,
+                source=BookingSource.telegram,
+                notes=payload.notes,
+                total_price=service.price,
+            )
+        )
+        start_at = end_at
+
+    holds = [
+        (step.staff_id, booking.start_at, booking.end_at, step.hold_token) for booking, step in zip(bookings, payload.steps)
+    ]
+    if not await slot_holds.check_all(payload.business_id, holds):
+        BOOKING_CONFLICTS.inc()
+        raise HTTPException(status_code=409, detail="Timeslot is held by another client")
+
+    await _commit_bookings(db, bookings)
+    await slot_holds.consume_all(payload.business_id, [(step.staff_id, step.hold_token) for step in payload.steps])
+    days_by_staff: dict[int, set[date]] = defaultdict(set)
+    for booking in bookings:
+        days_by_staff[booking.staff_id].update(slot_cache.booking_days(booking.start_at, booking.end_at, business.timezone))
+    for staff_id, days in days_by_staff.items():
+        await slot_cache.invalidate_days(payload.business_id, staff_id, sorted(days))
+    return [BookingOut.model_validate(booking) for booking in bookings]
+
+
+@router.post("/holds", response_model=SlotHoldOut, status_code=status.HTTP_201_CREATED)
+async def create_hold(payload: SlotHoldCreate, db: AsyncSession = Depends(get_db)) -> SlotHoldOut:
+    service = await reference_cache.get_service(db, payload.business_id, payload.service_id)
+    if not service or not service.is_active:
+        raise HTTPException(status_code=404, detail="Service not found")
+    business = await reference_cache.get_business(db, payload.business_id)
+
+    end_at = payload.start_at + timedelta(minutes=service.duration_minutes)
+    day = payload.start_at.astimezone(business.timezone).date()
+    slots = await find_free_slots(
+        db=db,
+        business_id=payload.business_id,
+        service_id=payload.service_id,
+        staff_id=payload.staff_id,
+        day=day,
+        step_minutes=payload.step_minutes,
+    )
+    if (payload.start_at, end_at) not in slots:
+        raise HTTPException(status_code=409, detail="Timeslot is no longer available")
+
+    try:
+        token, expires_at = await slot_holds.acquire(payload.business_id, payload.staff_id, payload.start_at, end_at)
+    except slot_holds.SlotUnavailableError as exc:
+        raise HTTPException(status_code=409, detail="Timeslot is no longer available") from exc
+    except RedisError as exc:
+        raise HTTPException(status_code=503, detail="Slot holds are temporarily unavailable") from exc
+
+    await availability_events.publish_change(payload.business_id, payload.staff_id, [day])
+    return SlotHoldOut(
+        token=token, staff_id=payload.staff_id, start_at=payload.start_at, end_at=end_at, expires_at=expires_at
+    )
+
+
+@router.delete("/holds/{token}", status_code=status.HTTP_204_NO_CONTENT)
+async def release_hold(token: str, business_id: int, staff_id: int, db: AsyncSession = Depends(get_db)) -> Response:
+    try:
+        released = await slot_holds.release(business_id, staff_id, token)
+    except RedisError as exc:
+        raise HTTPException(status_code=503, detail="Slot holds are temporarily unavailable") from exc
+
+    if released:
+        business = await reference_cache.get_business(db, business_id)
+        days = {day for start_at, end_at in released for day in slot_cache.booking_days(start_at, end_at, business.timezone)}
+        await availability_events.publish_change(business_id, staff_id, days)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
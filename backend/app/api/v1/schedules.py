@@ -0,0 +1,80 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_staff_token_payload
+from app.db.session import get_db
+from app.models import Schedule, ScheduleTemplate, Staff
+from app.schemas.schedule import ScheduleExceptionIn, ScheduleExceptionOut, ScheduleTemplateIn, ScheduleTemplateOut
+from app.services import schedule_templates, slot_cache
+
+router = APIRouter(prefix="/schedules", tags=["schedules"], dependencies=[Depends(get_staff_token_payload)])
+
+
+async def _get_staff(db: AsyncSession, staff_id: int) -> Staff:
+    staff = await db.get(Staff, staff_id)
+    if not staff:
+        raise HTTPException(status_code=404, detail="Staff not found")
+    return staff
+
+
+@router.get("/staff/{staff_id}/template", response_model=list[ScheduleTemplateOut])
+async def get_template(staff_id: int, db: AsyncSession = Depends(get_db)) -> list[ScheduleTemplateOut]:
+    await _get_staff(db, staff_id)
+    rows = await db.scalars(
+        select(ScheduleTemplate)
+        .where(ScheduleTemplate.staff_id == staff_id)
+        .order_by(ScheduleTemplate.weekday, ScheduleTemplate.start_time)
+    )
+    return [ScheduleTemplateOut.model_validate(row) for row in rows]
+
+
+@router.put("/staff/{staff_id}/template", response_model=list[ScheduleTemplateOut])
+async def replace_template(
+    staff_id: int,
+    payload: list[ScheduleTemplateIn],
+    db: AsyncSession = Depends(get_db),
+) -> list[ScheduleTemplateOut]:
+    staff = await _get_staff(db, staff_id)
+    await db.execute(delete(ScheduleTemplate).where(ScheduleTemplate.staff_id == staff_id))
+    rows = [ScheduleTemplate(staff_id=staff_id, **entry.model_dump()) for entry in payload]
+    db.add_all(rows)
+    await db.commit()
+
+    schedule_templates.invalidate_staff(staff_id)
+    await slot_cache.invalidate_staff(staff.business_id, staff_id)
+    return [ScheduleTemplateOut.model_validate(row) for row in rows]
+
+
+@router.post(
+    "/staff/{staff_id}/exceptions",
+    response_model=ScheduleExceptionOut,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_exception(
+    staff_id: int,
+    payload: ScheduleExceptionIn,
+    db: AsyncSession = Depends(get_db),
+) -> ScheduleExceptionOut:
+    staff = await _get_staff(db, staff_id)
+    schedule = Schedule(staff_id=staff_id, **payload.model_dump())
+    db.add(schedule)
+    await db.commit()
+    await db.refresh(schedule)
+
+    await slot_cache.invalidate_days(staff.business_id, staff_id, [schedule.day])
+    return ScheduleExceptionOut.model_validate(schedule)
+
+
+@router.delete("/exceptions/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_exception(schedule_id: int, db: AsyncSession = Depends(get_db)) -> Response:
+    schedule = await db.get(Schedule, schedule_id)
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Schedule entry not found")
+
+    staff = await _get_staff(db, schedule.staff_id)
+    await db.delete(schedule)
+    await db.commit()
+
+    await slot_cache.invalidate_days(staff.business_id, schedule.staff_id, [schedule.day])
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
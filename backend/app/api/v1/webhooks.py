@@ -1,11 +1,17 @@
-from decimal import Decimal
+import json
+import logging
 
 from fastapi import APIRouter, Depends, Header, HTTPException
-from sqlalchemy import select
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.metrics import WEBHOOK_PROCESSING_SECONDS
+from app.db.redis import redis_client
 from app.db.session import get_db
-from app.models import Booking, BookingStatus, PaymentMethod, Transaction, TransactionType
+from app.services.payments import EventOutcome, InvalidPaymentEvent, apply_yookassa_events, parse_yookassa_event
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
@@ -16,46 +22,29 @@ async def yookassa_webhook(
     db: AsyncSession = Depends(get_db),
     x_request_id: str | None = Header(default=None),
 ) -> dict:
-    if not x_request_id:
-        raise HTTPException(status_code=400, detail="Missing X-Request-Id")
-
-    obj = event.get("object", {})
-    payment_id = obj.get("id")
-    status = obj.get("status")
-    amount_data = obj.get("amount", {})
-    metadata = obj.get("metadata", {})
-    booking_id = metadata.get("booking_id")
-
-    if not payment_id or not booking_id:
-        raise HTTPException(status_code=400, detail="Invalid payment payload")
-
-    existing_tx = await db.scalar(select(Transaction).where(Transaction.external_payment_id == payment_id))
-    if existing_tx:
-        return {"ok": True, "idempotent": True}
-
-    booking = await db.scalar(select(Booking).where(Booking.id == int(booking_id)))
-    if not booking:
+    with WEBHOOK_PROCESSING_SECONDS.labels("yookassa").time():
+        if not x_request_id:
+            raise HTTPException(status_code=400, detail="Missing X-Request-Id")
+        try:
+            payment_event = parse_yookassa_event(event)
+        except InvalidPaymentEvent as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+        if settings.yookassa_webhook_mode == "queue":
+            try:
+                await redis_client.xadd(
+                    settings.yookassa_webhook_stream, {"event": json.dumps(event), "request_id": x_request_id}
+                )
+                return {"ok": True, "queued": True}
+            except RedisError as exc:
+                logger.warning("Webhook enqueue failed, processing inline: %s", exc)
+
+        [outcome] = await apply_yookassa_events(db, [payment_event])
+
+    if outcome == EventOutcome.booking_not_found:
         raise HTTPException(status_code=404, detail="Booking not found")
-
-    amount = Decimal(amount_data.get("value", "0"))
-
-    if status == "succeeded":
-        booking.status = BookingStatus.paid
-        transaction_type = TransactionType.payment
-    elif status == "canceled":
-        booking.status = BookingStatus.confirmed
-        transaction_type = TransactionType.refund
-    else:
+    if outcome == EventOutcome.duplicate:
+        return {"ok": True, "idempotent": True}
+    if outcome == EventOutcome.ignored:
         return {"ok": True, "ignored": True}
-
-    tx = Transaction(
-        booking_id=booking.id,
-        amount=amount,
-        transaction_type=transaction_type,
-        payment_method=PaymentMethod.yookassa,
-        external_payment_id=payment_id,
-    )
-    db.add(tx)
-    await db.commit()
-
     return {"ok": True}
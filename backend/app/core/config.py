@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -16,18 +17,78 @@ class Settings(BaseSettings):
     postgres_host: str = "db"
     postgres_port: int = 5432
 
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 10
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100
+    db_pgbouncer_mode: bool = False
+
     redis_host: str = "redis"
     redis_port: int = 6379
+    redis_db: int = 0
+    redis_socket_timeout_seconds: float = 0.5
+
+    slot_cache_enabled: bool = True
+    slot_cache_ttl_seconds: int = 600
+    slot_occupancy_ttl_seconds: int = 86400
+
+    reference_cache_ttl_seconds: int = 300
+    reference_cache_maxsize: int = 2048
+    schedule_template_cache_ttl_seconds: int = 60
+
+    availability_stream_heartbeat_seconds: int = 15
+
+    slot_hold_ttl_seconds: int = 300
 
     jwt_secret_key: str = "change-me-super-secret"
     jwt_algorithm: str = "HS256"
     jwt_access_token_expire_minutes: int = 60 * 12
+    jwt_backend: Literal["jose", "hmac"] = "jose"
+    jwt_verify_cache_maxsize: int = 10000
+
+    bulk_import_chunk_size: int = 5000
+    bulk_export_batch_size: int = 1000
+
+    password_bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 64
+
+    pending_booking_payment_window_minutes: int = 15
+    pending_booking_sweep_interval_seconds: float = 60
+    pending_booking_sweep_batch_size: int = 500
+
+    analytics_refresh_interval_seconds: float = 30
+    analytics_dirty_batch_size: int = 500
+    analytics_schedule_horizon_days: int = 60
 
     telegram_bot_token: str = ""
     telegram_bot_username: str = ""
+    telegram_init_data_max_age_seconds: int = 3600
+    telegram_init_data_cache_maxsize: int = 4096
+    telegram_session_token_expire_minutes: int = 15
+    telegram_api_base_url: str = "https://api.telegram.org"
+    telegram_api_timeout_seconds: float = 10
+    telegram_max_connections: int = 30
+    telegram_global_rate_per_second: float = 30
+    telegram_chat_rate_per_second: float = 1
+    telegram_send_max_attempts: int = 5
+
+    notification_batch_size: int = 500
+    notification_poll_interval_seconds: float = 30
+    notification_reminder_lead_minutes: int = 1440
 
     yookassa_shop_id: str = ""
     yookassa_secret_key: str = ""
+    yookassa_webhook_mode: Literal["sync", "queue"] = "sync"
+    yookassa_webhook_stream: str = "webhooks:yookassa"
+    yookassa_webhook_dead_letter_stream: str = "webhooks:yookassa:dead"
+    webhook_worker_group: str = "webhook-workers"
+    webhook_worker_batch_size: int = 200
+    webhook_worker_block_ms: int = 1000
+    webhook_worker_claim_idle_ms: int = 60000
+    webhook_worker_max_deliveries: int = 10
 
     cors_origins: list[str] = [
         "https://web.telegram.org",
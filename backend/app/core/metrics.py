@@ -0,0 +1,180 @@
+import os
+import time
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.session import pool_metrics
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Number of SQL statements executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 4, 6, 8, 12, 20, 50),
+)
+DB_SECONDS_PER_REQUEST = Histogram(
+    "db_query_seconds_per_request",
+    "Time spent executing SQL statements per HTTP request",
+    ["route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+SLOT_COMPUTE_SECONDS = Histogram(
+    "slot_compute_seconds",
+    "CPU time spent turning schedules and bookings into slots",
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+SLOTS_RETURNED = Histogram(
+    "slots_returned",
+    "Number of slots returned per availability lookup",
+    ["mode"],
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+SLOT_CACHE_LOOKUPS = Counter("slot_cache_lookups_total", "Slot cache day lookups", ["result"])
+SLOT_OCCUPANCY_LOOKUPS = Counter("slot_occupancy_lookups_total", "Occupancy bitmap day lookups", ["result"])
+NOTIFICATIONS_SENT = Counter("notifications_sent_total", "Telegram notifications by kind and result", ["kind", "result"])
+BOOKING_CONFLICTS = Counter("booking_conflicts_total", "Booking attempts rejected with 409")
+WEBHOOK_PROCESSING_SECONDS = Histogram(
+    "webhook_processing_seconds",
+    "Payment webhook processing latency",
+    ["provider"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+PASSWORD_HASH_PENDING = Gauge(
+    "password_hash_pending", "Password hash/verify calls queued or running", multiprocess_mode="livesum"
+)
+PASSWORD_HASH_WAIT_SECONDS = Histogram(
+    "password_hash_wait_seconds",
+    "Time password hash/verify calls wait for an executor slot",
+    ["operation"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_seconds",
+    "Time spent hashing or verifying passwords",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+AVAILABILITY_SUBSCRIBERS = Gauge(
+    "availability_stream_subscribers", "Open availability streams", multiprocess_mode="livesum"
+)
+
+
+@dataclass
+class RequestDbStats:
+    queries: int = 0
+    seconds: float = 0.0
+
+
+_request_db_stats: ContextVar[RequestDbStats | None] = ContextVar("request_db_stats", default=None)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info["query_started_at"].pop()
+        stats = _request_db_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.seconds += time.perf_counter() - started
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _handle_error(exception_context) -> None:
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started_at"):
+            connection.info["query_started_at"].pop()
+
+
+class PoolCollector:
+    def collect(self):
+        metrics = pool_metrics()
+        for name in ("size", "checked_in", "checked_out", "overflow"):
+            yield GaugeMetricFamily(f"db_pool_{name}", f"Connection pool {name.replace('_', ' ')}", value=metrics[name])
+        yield CounterMetricFamily("db_pool_checkouts", "Connection pool checkouts", value=metrics["checkouts"])
+        yield CounterMetricFamily("db_pool_timeouts", "Connection pool checkout timeouts", value=metrics["timeouts"])
+        yield CounterMetricFamily(
+            "db_pool_wait_seconds", "Time spent waiting for pool connections", value=metrics["wait_seconds_total"]
+        )
+
+
+REGISTRY.register(PoolCollector())
+
+
+class CacheCollector:
+    def __init__(self) -> None:
+        self._sources: list[Callable[[], dict[str, dict[str, int]]]] = []
+
+    def add_source(self, source: Callable[[], dict[str, dict[str, int]]]) -> None:
+        self._sources.append(source)
+
+    def collect(self):
+        size = GaugeMetricFamily("memory_cache_entries", "In-process cache entries", labels=["cache"])
+        hits = CounterMetricFamily("memory_cache_hits", "In-process cache hits", labels=["cache"])
+        misses = CounterMetricFamily("memory_cache_misses", "In-process cache misses", labels=["cache"])
+        for source in self._sources:
+            for name, stats in source().items():
+                size.add_metric([name], stats["size"])
+                hits.add_metric([name], stats["hits"])
+                misses.add_metric([name], stats["misses"])
+        yield size
+        yield hits
+        yield misses
+
+
+MEMORY_CACHES = CacheCollector()
+REGISTRY.register(MEMORY_CACHES)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestDbStats()
+        token = _request_db_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_db_stats.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route, str(status_code)).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(route).observe(stats.queries)
+            DB_SECONDS_PER_REQUEST.labels(route).observe(stats.seconds)
+
+
+def render_latest() -> tuple[bytes, str]:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
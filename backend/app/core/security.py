@@ -1,16 +1,38 @@
+import asyncio
 import hashlib
 import hmac
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
 from urllib.parse import parse_qsl
 
 from fastapi import HTTPException, status
-from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import MEMORY_CACHES, PASSWORD_HASH_PENDING, PASSWORD_HASH_SECONDS, PASSWORD_HASH_WAIT_SECONDS
+from app.core.tokens import TOKEN_BACKENDS, TokenError, TokenVerifier
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.password_bcrypt_rounds)
+
+_password_executor = ThreadPoolExecutor(max_workers=settings.password_hash_workers, thread_name_prefix="password-hash")
+_password_slots = asyncio.Semaphore(settings.password_hash_max_pending)
+
+token_verifier = TokenVerifier(
+    TOKEN_BACKENDS[settings.jwt_backend](settings.jwt_secret_key, settings.jwt_algorithm),
+    settings.jwt_verify_cache_maxsize,
+)
+
+_verified_init_data: TTLCache[bytes, dict] = TTLCache(
+    settings.telegram_init_data_cache_maxsize, settings.telegram_init_data_max_age_seconds
+)
+
+MEMORY_CACHES.add_source(
+    lambda: {"jwt_verify": token_verifier.cache_stats(), "telegram_init_data": _verified_init_data.stats()}
+)
 
 
 class TokenPayload(dict):
@@ -19,19 +41,19 @@ class TokenPayload(dict):
         return self.get("sub")
 
 
-def create_access_token(subject: str, expires_delta: timedelta | None = None) -> str:
+def create_access_token(subject: str, expires_delta: timedelta | None = None, claims: dict | None = None) -> str:
     expire = datetime.now(UTC) + (expires_delta or timedelta(minutes=settings.jwt_access_token_expire_minutes))
-    to_encode = {"exp": expire, "sub": subject}
-    return jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    to_encode = {**(claims or {}), "exp": expire, "sub": subject}
+    return token_verifier.backend.encode(to_encode)
 
 
 def verify_access_token(token: str) -> TokenPayload:
     try:
-        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+        payload = token_verifier.verify(token)
         if not payload.get("sub"):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
         return TokenPayload(payload)
-    except JWTError as exc:
+    except TokenError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials") from exc
 
 
@@ -43,18 +65,57 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def validate_telegram_init_data(init_data: str, max_age_seconds: int = 3600) -> dict:
+def _run_timed(operation: str, queued_at: float, fn, *args):
+    PASSWORD_HASH_WAIT_SECONDS.labels(operation).observe(time.perf_counter() - queued_at)
+    with PASSWORD_HASH_SECONDS.labels(operation).time():
+        return fn(*args)
+
+
+async def _run_password_task(operation: str, fn, *args):
+    PASSWORD_HASH_PENDING.inc()
+    try:
+        async with _password_slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                _password_executor, _run_timed, operation, time.perf_counter(), fn, *args
+            )
+    finally:
+        PASSWORD_HASH_PENDING.dec()
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_password_task("hash", hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_password_task("verify", verify_password, plain_password, hashed_password)
+
+
+@lru_cache(maxsize=4)
+def _telegram_secret_key(bot_token: str) -> bytes:
+    return hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
+
+
+def validate_telegram_init_data(init_data: str, max_age_seconds: int = settings.telegram_init_data_max_age_seconds) -> dict:
     if not settings.telegram_bot_token:
         raise HTTPException(status_code=500, detail="Telegram bot token is not configured")
 
+    cache_key = hashlib.sha256(init_data.encode()).digest()
+    cached = _verified_init_data.get(cache_key)
+    if cached is not None:
+        if int(datetime.now(UTC).timestamp()) - cached["auth_date"] > max_age_seconds:
+            raise HTTPException(status_code=401, detail="Telegram initData expired")
+        return cached
+
     parsed = dict(parse_qsl(init_data, keep_blank_values=True))
     provided_hash = parsed.pop("hash", None)
     if not provided_hash:
         raise HTTPException(status_code=401, detail="Invalid Telegram initData hash")
 
     data_check_string = "\n".join(f"{k}={v}" for k, v in sorted(parsed.items(), key=lambda item: item[0]))
-    secret_key = hmac.new(b"WebAppData", settings.telegram_bot_token.encode(), hashlib.sha256).digest()
-    calculated_hash = hmac.new(secret_key, data_check_string.encode(), hashlib.sha256).hexdigest()
+    calculated_hash = hmac.new(
+        _telegram_secret_key(settings.telegram_bot_token), data_check_string.encode(), hashlib.sha256
+    ).hexdigest()
 
     if not hmac.compare_digest(calculated_hash, provided_hash):
         raise HTTPException(status_code=401, detail="Telegram initData verification failed")
@@ -73,4 +134,6 @@ def validate_telegram_init_data(init_data: str, max_age_seconds: int = 3600) ->
     except json.JSONDecodeError as exc:
         raise HTTPException(status_code=401, detail="Telegram user payload invalid") from exc
 
-    return {"user": user, "auth_date": auth_date, "query_id": parsed.get("query_id")}
+    verified = {"user": user, "auth_date": auth_date, "query_id": parsed.get("query_id")}
+    _verified_init_data.set(cache_key, verified, ttl_seconds=auth_date + max_age_seconds - now)
+    return verified
@@ -0,0 +1,123 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from datetime import datetime
+from typing import Protocol
+
+from jose import JWTError, jwt
+
+from app.core.cache import TTLCache
+
+
+class TokenError(Exception):
+    pass
+
+
+class TokenBackend(Protocol):
+    def encode(self, claims: dict) -> str: ...
+
+    def decode(self, token: str) -> dict: ...
+
+
+class JoseBackend:
+    def __init__(self, secret_key: str, algorithm: str) -> None:
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+
+    def encode(self, claims: dict) -> str:
+        return jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return jwt.decode(token, self.secret_key, algorithms=[self.algorithm], options={"require_exp": True})
+        except JWTError as exc:
+            raise TokenError(str(exc)) from exc
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class HmacBackend:
+    DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+    def __init__(self, secret_key: str, algorithm: str) -> None:
+        if algorithm not in self.DIGESTS:
+            raise ValueError(f"HmacBackend does not support {algorithm}")
+        self.secret_key = secret_key.encode()
+        self.algorithm = algorithm
+        self.digest = self.DIGESTS[algorithm]
+        self.header = _b64encode(json.dumps({"alg": algorithm, "typ": "JWT"}, separators=(",", ":")).encode())
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        return hmac.new(self.secret_key, signing_input, self.digest).digest()
+
+    def encode(self, claims: dict) -> str:
+        claims = {key: int(value.timestamp()) if isinstance(value, datetime) else value for key, value in claims.items()}
+        payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+        signing_input = f"{self.header}.{payload}"
+        return f"{signing_input}.{_b64encode(self._sign(signing_input.encode()))}"
+
+    def decode(self, token: str) -> dict:
+        try:
+            header_segment, payload_segment, signature_segment = token.split(".")
+            header = json.loads(_b64decode(header_segment))
+            signature = _b64decode(signature_segment)
+        except (ValueError, binascii.Error) as exc:
+            raise TokenError("Malformed token") from exc
+
+        if not isinstance(header, dict) or header.get("alg") != self.algorithm:
+            raise TokenError("Unexpected token algorithm")
+        if not hmac.compare_digest(self._sign(f"{header_segment}.{payload_segment}".encode()), signature):
+            raise TokenError("Signature verification failed")
+
+        try:
+            claims = json.loads(_b64decode(payload_segment))
+        except (ValueError, binascii.Error) as exc:
+            raise TokenError("Malformed token payload") from exc
+        if not isinstance(claims, dict):
+            raise TokenError("Malformed token payload")
+
+        now = time.time()
+        exp, nbf = claims.get("exp"), claims.get("nbf")
+        if not isinstance(exp, int | float):
+            raise TokenError("Token has no expiry")
+        if exp <= now:
+            raise TokenError("Signature has expired")
+        if nbf is not None and (not isinstance(nbf, int | float) or nbf > now):
+            raise TokenError("The token is not yet valid")
+        return claims
+
+
+TOKEN_BACKENDS: dict[str, type[JoseBackend] | type[HmacBackend]] = {"jose": JoseBackend, "hmac": HmacBackend}
+
+
+class TokenVerifier:
+    def __init__(self, backend: TokenBackend, cache_maxsize: int) -> None:
+        self.backend = backend
+        self._cache: TTLCache[bytes, dict] = TTLCache(cache_maxsize, 0)
+
+    def verify(self, token: str) -> dict:
+        key = hashlib.sha256(token.encode()).digest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        claims = self.backend.decode(token)
+        exp = claims.get("exp")
+        if isinstance(exp, int | float) and exp > time.time():
+            self._cache.set(key, claims, ttl_seconds=exp - time.time())
+        return claims
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def cache_stats(self) -> dict[str, int]:
+        return self._cache.stats()
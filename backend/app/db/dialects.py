@@ -0,0 +1,7 @@
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def upsert_insert(db: AsyncSession):
+    return sqlite_insert if db.get_bind().dialect.name == "sqlite" else postgresql_insert
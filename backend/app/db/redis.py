@@ -0,0 +1,21 @@
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+
+def create_redis_client(socket_timeout: float | None = settings.redis_socket_timeout_seconds) -> Redis:
+    return Redis(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        db=settings.redis_db,
+        decode_responses=True,
+        socket_timeout=socket_timeout,
+        socket_connect_timeout=settings.redis_socket_timeout_seconds,
+    )
+
+
+redis_client = create_redis_client()
+
+
+async def get_redis() -> Redis:
+    return redis_client
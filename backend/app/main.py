@@ -1,11 +1,29 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.responses import FastJSONResponse
+from app.api.v1.admin import router as admin_router
+from app.api.v1.auth import router as auth_router
 from app.api.v1.booking import router as booking_router
+from app.api.v1.schedules import router as schedules_router
 from app.api.v1.webhooks import router as webhooks_router
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, instrument_engine, render_latest
+from app.db.session import engine, pool_metrics
+from app.services.availability_events import hub as availability_hub
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    availability_hub.start()
+    yield
+    await availability_hub.stop()
+
 
-app = FastAPI(title=settings.project_name)
+app = FastAPI(title=settings.project_name, lifespan=lifespan, default_response_class=FastJSONResponse)
+instrument_engine(engine)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,6 +32,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/health")
@@ -21,5 +40,19 @@ async def health() -> dict:
     return {"status": "ok"}
 
 
+@app.get("/health/db")
+async def health_db() -> dict:
+    return {"status": "ok", "pool": pool_metrics()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    content, media_type = render_latest()
+    return Response(content=content, media_type=media_type)
+
+
+app.include_router(admin_router, prefix=settings.api_v1_prefix)
+app.include_router(auth_router, prefix=settings.api_v1_prefix)
 app.include_router(booking_router, prefix=settings.api_v1_prefix)
+app.include_router(schedules_router, prefix=settings.api_v1_prefix)
 app.include_router(webhooks_router, prefix=settings.api_v1_prefix)
@@ -10,13 +10,18 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
+    SmallInteger,
     String,
     Text,
     Time,
     UniqueConstraint,
+    column,
+    text,
 )
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -31,6 +36,17 @@ class BookingStatus(str, enum.Enum):
     paid = "paid"
     no_show = "no_show"
     completed = "completed"
+    expired = "expired"
+
+
+BLOCKING_BOOKING_STATUSES = (
+    BookingStatus.pending,
+    BookingStatus.confirmed,
+    BookingStatus.paid,
+    BookingStatus.completed,
+)
+BLOCKING_BOOKING_STATUS_SQL = "status IN ({})".format(", ".join(f"'{status.value}'" for status in BLOCKING_BOOKING_STATUSES))
+BOOKING_OVERLAP_CONSTRAINT = "ex_bookings_staff_no_overlap"
 
 
 class BookingSource(str, enum.Enum):
@@ -44,6 +60,11 @@ class ScheduleType(str, enum.Enum):
     break_time = "break"
 
 
+SCHEDULE_TYPE_ENUM = Enum(
+    ScheduleType, name="scheduletype", values_callable=lambda members: [member.value for member in members]
+)
+
+
 class TransactionType(str, enum.Enum):
     payment = "payment"
     refund = "refund"
@@ -83,6 +104,7 @@ class Staff(Base):
 
     business: Mapped[Business] = relationship(back_populates="staff_members")
     schedules: Mapped[list["Schedule"]] = relationship(back_populates="staff", cascade="all, delete-orphan")
+    schedule_templates: Mapped[list["ScheduleTemplate"]] = relationship(back_populates="staff", cascade="all, delete-orphan")
     bookings: Mapped[list["Booking"]] = relationship(back_populates="staff")
 
 
@@ -105,18 +127,39 @@ class Schedule(Base):
     __tablename__ = "schedules"
     __table_args__ = (
         CheckConstraint("end_time > start_time", name="ck_schedule_time_order"),
+        Index("ix_schedules_staff_id_day", "staff_id", "day"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    staff_id: Mapped[int] = mapped_column(ForeignKey("staff.id", ondelete="CASCADE"), index=True)
-    schedule_type: Mapped[ScheduleType] = mapped_column(Enum(ScheduleType), nullable=False)
-    day: Mapped[date] = mapped_column(Date, index=True)
+    staff_id: Mapped[int] = mapped_column(ForeignKey("staff.id", ondelete="CASCADE"))
+    schedule_type: Mapped[ScheduleType] = mapped_column(SCHEDULE_TYPE_ENUM, nullable=False)
+    day: Mapped[date] = mapped_column(Date)
     start_time: Mapped[time] = mapped_column(Time, nullable=False)
     end_time: Mapped[time] = mapped_column(Time, nullable=False)
 
     staff: Mapped[Staff] = relationship(back_populates="schedules")
 
 
+class ScheduleTemplate(Base):
+    __tablename__ = "schedule_templates"
+    __table_args__ = (
+        CheckConstraint("end_time > start_time", name="ck_schedule_template_time_order"),
+        CheckConstraint("weekday BETWEEN 0 AND 6", name="ck_schedule_template_weekday"),
+        Index("ix_schedule_templates_staff_id_weekday", "staff_id", "weekday"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    staff_id: Mapped[int] = mapped_column(ForeignKey("staff.id", ondelete="CASCADE"))
+    weekday: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    schedule_type: Mapped[ScheduleType] = mapped_column(SCHEDULE_TYPE_ENUM, nullable=False)
+    start_time: Mapped[time] = mapped_column(Time, nullable=False)
+    end_time: Mapped[time] = mapped_column(Time, nullable=False)
+    valid_from: Mapped[date] = mapped_column(Date, nullable=False)
+    valid_until: Mapped[date | None] = mapped_column(Date)
+
+    staff: Mapped[Staff] = relationship(back_populates="schedule_templates")
+
+
 class Client(Base):
     __tablename__ = "clients"
     __table_args__ = (
@@ -138,6 +181,30 @@ class Client(Base):
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        ExcludeConstraint(
+            ("staff_id", "="),
+            (func.tstzrange(column("start_at"), column("end_at"), text("'[)'")), "&&"),
+            name=BOOKING_OVERLAP_CONSTRAINT,
+            using="gist",
+            where=text(BLOCKING_BOOKING_STATUS_SQL),
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_bookings_staff_id_end_at_blocking",
+            "staff_id",
+            "end_at",
+            postgresql_include=["start_at"],
+            postgresql_where=text(BLOCKING_BOOKING_STATUS_SQL),
+        ),
+        Index(
+            "ix_bookings_status_created_at_pending",
+            "status",
+            "created_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        Index("ix_bookings_start_at_unconfirmed", "start_at", postgresql_where=text("confirmation_sent_at IS NULL")),
+        Index("ix_bookings_start_at_unreminded", "start_at", postgresql_where=text("reminder_sent_at IS NULL")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     business_id: Mapped[int] = mapped_column(ForeignKey("businesses.id", ondelete="CASCADE"), index=True)
@@ -145,13 +212,15 @@ class Booking(Base):
     staff_id: Mapped[int] = mapped_column(ForeignKey("staff.id", ondelete="RESTRICT"), index=True)
     client_id: Mapped[int] = mapped_column(ForeignKey("clients.id", ondelete="SET NULL"), nullable=True, index=True)
 
-    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
-    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     status: Mapped[BookingStatus] = mapped_column(Enum(BookingStatus), nullable=False, default=BookingStatus.pending)
     source: Mapped[BookingSource] = mapped_column(Enum(BookingSource), nullable=False, default=BookingSource.telegram)
     notes: Mapped[str | None] = mapped_column(Text)
     total_price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    confirmation_sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    reminder_sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     business: Mapped[Business] = relationship(back_populates="bookings")
     service: Mapped[Service] = relationship(back_populates="bookings")
@@ -160,6 +229,23 @@ class Booking(Base):
     transactions: Mapped[list["Transaction"]] = relationship(back_populates="booking")
 
 
+class StaffDailyStats(Base):
+    __tablename__ = "staff_daily_stats"
+    __table_args__ = (Index("ix_staff_daily_stats_business_id_day", "business_id", "day"),)
+
+    staff_id: Mapped[int] = mapped_column(ForeignKey("staff.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    business_id: Mapped[int] = mapped_column(ForeignKey("businesses.id", ondelete="CASCADE"), nullable=False)
+    work_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    booked_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    bookings_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    no_show_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    booked_value: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=0)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
 class Transaction(Base):
     __tablename__ = "transactions"
 
@@ -168,7 +254,7 @@ class Transaction(Base):
     amount: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
     transaction_type: Mapped[TransactionType] = mapped_column(Enum(TransactionType), nullable=False)
     payment_method: Mapped[PaymentMethod] = mapped_column(Enum(PaymentMethod), nullable=False)
-    external_payment_id: Mapped[str | None] = mapped_column(String(255), index=True)
+    external_payment_id: Mapped[str | None] = mapped_column(String(255), unique=True, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     booking: Mapped[Booking] = relationship(back_populates="transactions")
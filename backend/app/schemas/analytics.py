@@ -0,0 +1,54 @@
+from datetime import date
+from decimal import Decimal
+
+from pydantic import BaseModel, computed_field, model_validator
+
+
+class DashboardQuery(BaseModel):
+    date_from: date
+    date_to: date
+    staff_id: int | None = None
+
+    @model_validator(mode="after")
+    def check_range(self) -> "DashboardQuery":
+        if self.date_to < self.date_from:
+            raise ValueError("date_to must not be earlier than date_from")
+        return self
+
+
+class StatsOut(BaseModel):
+    work_minutes: int = 0
+    booked_minutes: int = 0
+    bookings_count: int = 0
+    completed_count: int = 0
+    no_show_count: int = 0
+    booked_value: Decimal = Decimal("0")
+    revenue: Decimal = Decimal("0")
+
+    @computed_field
+    @property
+    def utilization(self) -> float:
+        return round(self.booked_minutes / self.work_minutes, 4) if self.work_minutes else 0.0
+
+    @computed_field
+    @property
+    def no_show_rate(self) -> float:
+        attended = self.completed_count + self.no_show_count
+        return round(self.no_show_count / attended, 4) if attended else 0.0
+
+
+class DayStatsOut(StatsOut):
+    day: date
+
+
+class StaffStatsOut(StatsOut):
+    staff_id: int
+
+
+class DashboardOut(BaseModel):
+    business_id: int
+    date_from: date
+    date_to: date
+    totals: StatsOut
+    by_day: list[DayStatsOut]
+    by_staff: list[StaffStatsOut]
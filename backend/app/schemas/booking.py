@@ -1,9 +1,18 @@
 from datetime import date, datetime
+from enum import StrEnum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.models import BookingStatus
 
+MAX_SLOT_RANGE_DAYS = 42
+MAX_CHAIN_SERVICES = 5
+
+
+class SlotFormat(StrEnum):
+    full = "full"
+    compact = "compact"
+
 
 class SlotOut(BaseModel):
     start_at: datetime
@@ -16,6 +25,104 @@ class SlotQuery(BaseModel):
     staff_id: int
     day: date
     step_minutes: int = Field(default=15, ge=5, le=60)
+    format: SlotFormat = SlotFormat.full
+
+
+class StaffSlotOut(SlotOut):
+    staff_ids: list[int]
+
+
+class DateRangeQuery(BaseModel):
+    date_from: date
+    date_to: date
+    step_minutes: int = Field(default=15, ge=5, le=60)
+
+    @model_validator(mode="after")
+    def check_range(self) -> "DateRangeQuery":
+        if self.date_to < self.date_from:
+            raise ValueError("date_to must not be earlier than date_from")
+        if (self.date_to - self.date_from).days >= MAX_SLOT_RANGE_DAYS:
+            raise ValueError(f"Date range must not exceed {MAX_SLOT_RANGE_DAYS} days")
+        return self
+
+
+class SlotRangeQuery(DateRangeQuery):
+    business_id: int
+    service_id: int
+    staff_id: int
+    format: SlotFormat = SlotFormat.full
+
+
+class AnyStaffSlotQuery(DateRangeQuery):
+    business_id: int
+    service_id: int
+    format: SlotFormat = SlotFormat.full
+
+
+class ChainStepQuery(BaseModel):
+    service_id: int
+    staff_id: int | None = None
+
+
+class ChainSlotQuery(DateRangeQuery):
+    business_id: int
+    steps: list[ChainStepQuery] = Field(min_length=1, max_length=MAX_CHAIN_SERVICES)
+
+
+class DaySlotsOut(BaseModel):
+    day: date
+    slots: list[SlotOut]
+
+
+class CompactDaySlotsOut(BaseModel):
+    day: date
+    midnight: datetime
+    duration_minutes: int
+    offsets: list[int]
+
+
+class CompactDayStaffSlotsOut(CompactDaySlotsOut):
+    staff_ids: list[list[int]]
+
+
+class SlotDeltaOut(BaseModel):
+    day: date
+    added: list[SlotOut]
+    removed: list[SlotOut]
+
+
+class DayStaffSlotsOut(BaseModel):
+    day: date
+    slots: list[StaffSlotOut]
+
+
+class ChainLinkOut(StaffSlotOut):
+    service_id: int
+
+
+class ChainSlotOut(SlotOut):
+    links: list[ChainLinkOut]
+
+
+class DayChainSlotsOut(BaseModel):
+    day: date
+    chains: list[ChainSlotOut]
+
+
+class SlotHoldCreate(BaseModel):
+    business_id: int
+    service_id: int
+    staff_id: int
+    start_at: datetime
+    step_minutes: int = Field(default=15, ge=5, le=60)
+
+
+class SlotHoldOut(BaseModel):
+    token: str
+    staff_id: int
+    start_at: datetime
+    end_at: datetime
+    expires_at: datetime
 
 
 class BookingCreate(BaseModel):
@@ -25,6 +132,21 @@ class BookingCreate(BaseModel):
     client_id: int | None = None
     start_at: datetime
     notes: str | None = None
+    hold_token: str | None = None
+
+
+class ChainBookingStep(BaseModel):
+    service_id: int
+    staff_id: int
+    hold_token: str | None = None
+
+
+class ChainBookingCreate(BaseModel):
+    business_id: int
+    client_id: int | None = None
+    start_at: datetime
+    notes: str | None = None
+    steps: list[ChainBookingStep] = Field(min_length=1, max_length=MAX_CHAIN_SERVICES)
 
 
 class BookingOut(BaseModel):
@@ -0,0 +1,65 @@
+from datetime import date
+from decimal import Decimal
+from enum import StrEnum
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.models import BookingStatus, PaymentMethod
+from app.schemas.schedule import ScheduleTimes
+
+
+class BulkKind(StrEnum):
+    staff = "staff"
+    services = "services"
+    schedules = "schedules"
+
+
+class BulkFormat(StrEnum):
+    csv = "csv"
+    jsonl = "jsonl"
+
+
+class StaffImportRow(BaseModel):
+    full_name: str = Field(min_length=1, max_length=255)
+    role: str = Field(default="master", min_length=1, max_length=100)
+    avatar_url: str | None = Field(default=None, max_length=1024)
+    bio: str | None = None
+    is_active: bool = True
+
+
+class ServiceImportRow(BaseModel):
+    name: str = Field(min_length=1, max_length=255)
+    price: Decimal = Field(ge=0, max_digits=10, decimal_places=2)
+    duration_minutes: int = Field(gt=0)
+    category_id: int | None = None
+    is_active: bool = True
+
+
+class ScheduleImportRow(ScheduleTimes):
+    staff_id: int
+    day: date
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    imported: int
+    failed: int
+    errors: list[ImportRowError]
+
+
+class BookingExportQuery(BaseModel):
+    date_from: date
+    date_to: date
+    status: list[BookingStatus] = []
+    payment_method: list[PaymentMethod] = []
+    format: BulkFormat = BulkFormat.csv
+
+    @model_validator(mode="after")
+    def check_range(self) -> "BookingExportQuery":
+        if self.date_to < self.date_from:
+            raise ValueError("date_to must not be earlier than date_from")
+        return self
@@ -0,0 +1,45 @@
+from decimal import Decimal
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from pydantic import BaseModel, Field, field_validator
+
+
+class BusinessUpdate(BaseModel):
+    timezone: str | None = Field(default=None, max_length=64)
+    currency: str | None = Field(default=None, min_length=1, max_length=8)
+
+    @field_validator("timezone")
+    @classmethod
+    def check_timezone(cls, value: str | None) -> str | None:
+        if value is not None:
+            try:
+                ZoneInfo(value)
+            except (ZoneInfoNotFoundError, ValueError) as exc:
+                raise ValueError(f"Unknown timezone {value}") from exc
+        return value
+
+
+class BusinessOut(BaseModel):
+    id: int
+    name: str
+    timezone: str
+    currency: str
+
+    model_config = {"from_attributes": True}
+
+
+class ServiceUpdate(BaseModel):
+    price: Decimal | None = Field(default=None, ge=0, max_digits=10, decimal_places=2)
+    duration_minutes: int | None = Field(default=None, gt=0)
+    is_active: bool | None = None
+
+
+class ServiceOut(BaseModel):
+    id: int
+    business_id: int
+    name: str
+    price: Decimal
+    duration_minutes: int
+    is_active: bool
+
+    model_config = {"from_attributes": True}
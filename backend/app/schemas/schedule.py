@@ -0,0 +1,46 @@
+from datetime import date, time
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.models import ScheduleType
+
+
+class ScheduleTimes(BaseModel):
+    schedule_type: ScheduleType
+    start_time: time
+    end_time: time
+
+    @model_validator(mode="after")
+    def check_time_order(self) -> "ScheduleTimes":
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time must be after start_time")
+        return self
+
+
+class ScheduleTemplateIn(ScheduleTimes):
+    weekday: int = Field(ge=0, le=6)
+    valid_from: date
+    valid_until: date | None = None
+
+    @model_validator(mode="after")
+    def check_validity(self) -> "ScheduleTemplateIn":
+        if self.valid_until is not None and self.valid_until < self.valid_from:
+            raise ValueError("valid_until must not be before valid_from")
+        return self
+
+
+class ScheduleTemplateOut(ScheduleTemplateIn):
+    id: int
+
+    model_config = {"from_attributes": True}
+
+
+class ScheduleExceptionIn(ScheduleTimes):
+    day: date
+
+
+class ScheduleExceptionOut(ScheduleExceptionIn):
+    id: int
+    staff_id: int
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,85 @@
+from collections.abc import AsyncIterator
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import Select, and_, select
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models import Booking, Transaction
+from app.schemas.bulk import BookingExportQuery, BulkFormat
+from app.services.bulk_io import encode_rows
+
+BOOKING_EXPORT_COLUMNS = (
+    "booking_id",
+    "booking_created_at",
+    "start_at",
+    "end_at",
+    "status",
+    "source",
+    "service_id",
+    "staff_id",
+    "client_id",
+    "total_price",
+    "transaction_id",
+    "transaction_type",
+    "payment_method",
+    "amount",
+    "external_payment_id",
+    "transaction_created_at",
+)
+
+
+def booking_export_query(business_id: int, query: BookingExportQuery, tz: ZoneInfo) -> Select:
+    window_start = datetime.combine(query.date_from, time.min, tzinfo=tz)
+    window_end = datetime.combine(query.date_to + timedelta(days=1), time.min, tzinfo=tz)
+
+    transaction_join = Transaction.booking_id == Booking.id
+    if query.payment_method:
+        transaction_join = and_(transaction_join, Transaction.payment_method.in_(query.payment_method))
+
+    statement = (
+        select(
+            Booking.id,
+            Booking.created_at,
+            Booking.start_at,
+            Booking.end_at,
+            Booking.status,
+            Booking.source,
+            Booking.service_id,
+            Booking.staff_id,
+            Booking.client_id,
+            Booking.total_price,
+            Transaction.id,
+            Transaction.transaction_type,
+            Transaction.payment_method,
+            Transaction.amount,
+            Transaction.external_payment_id,
+            Transaction.created_at,
+        )
+        .join(Transaction, transaction_join, isouter=not query.payment_method)
+        .where(and_(Booking.business_id == business_id, Booking.start_at >= window_start, Booking.start_at < window_end))
+        .order_by(Booking.start_at, Booking.id, Transaction.id)
+    )
+    if query.status:
+        statement = statement.where(Booking.status.in_(query.status))
+    return statement
+
+
+async def export_bookings(business_id: int, query: BookingExportQuery, tz: ZoneInfo) -> AsyncIterator[str]:
+    if query.format == BulkFormat.csv:
+        yield encode_rows((), [BOOKING_EXPORT_COLUMNS], query.format)
+
+    batch_size = settings.bulk_export_batch_size
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(
+            booking_export_query(business_id, query, tz).execution_options(yield_per=batch_size)
+        )
+        batch = []
+        async for row in result:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield encode_rows(BOOKING_EXPORT_COLUMNS, batch, query.format)
+                batch.clear()
+        if batch:
+            yield encode_rows(BOOKING_EXPORT_COLUMNS, batch, query.format)
@@ -0,0 +1,201 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from decimal import Decimal
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.dialects import upsert_insert
+from app.db.redis import redis_client
+from app.db.session import AsyncSessionLocal
+from app.models import (
+    Booking,
+    BookingStatus,
+    ScheduleType,
+    Staff,
+    StaffDailyStats,
+    Transaction,
+    TransactionType,
+)
+from app.schemas.analytics import DashboardOut, DashboardQuery, DayStatsOut, StaffStatsOut, StatsOut
+from app.services import reference_cache
+from app.services.analytics_dirty import DIRTY_KEY, parse_member
+from app.services.intervals import subtract_intervals
+from app.services.slot_finder import load_day_schedules
+
+BOOKED_STATUSES = (BookingStatus.confirmed, BookingStatus.paid, BookingStatus.completed, BookingStatus.no_show)
+STAT_COLUMNS = (
+    "work_minutes",
+    "booked_minutes",
+    "bookings_count",
+    "completed_count",
+    "no_show_count",
+    "booked_value",
+    "revenue",
+)
+
+
+@dataclass
+class DayStats:
+    work_minutes: int = 0
+    booked_minutes: int = 0
+    bookings_count: int = 0
+    completed_count: int = 0
+    no_show_count: int = 0
+    booked_value: Decimal = Decimal("0")
+    revenue: Decimal = Decimal("0")
+
+
+def _minutes(delta: timedelta) -> int:
+    return int(delta.total_seconds() // 60)
+
+
+def _work_minutes(day: date, entries, tz) -> int:
+    work, breaks = [], []
+    for entry in entries:
+        start = datetime.combine(day, entry.start_time, tzinfo=tz)
+        end = datetime.combine(day, entry.end_time, tzinfo=tz)
+        if entry.schedule_type == ScheduleType.day_off:
+            return 0
+        (work if entry.schedule_type == ScheduleType.work else breaks).append((start, end))
+    return sum(_minutes(end - start) for start, end in subtract_intervals(work, breaks))
+
+
+async def refresh_business(db: AsyncSession, business_id: int, days_by_staff: dict[int, set[date] | None]) -> int:
+    business = await reference_cache.get_business(db, business_id)
+    if not business:
+        return 0
+    tz = business.timezone
+
+    today = datetime.now(UTC).astimezone(tz).date()
+    horizon = {today + timedelta(days=offset) for offset in range(-1, settings.analytics_schedule_horizon_days + 1)}
+    days_by_staff = {staff_id: horizon if days is None else days for staff_id, days in days_by_staff.items()}
+    staff_ids = sorted(days_by_staff)
+    date_from = min(min(days) for days in days_by_staff.values())
+    date_to = max(max(days) for days in days_by_staff.values())
+    window_start = datetime.combine(date_from, time.min, tzinfo=tz)
+    window_end = datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=tz)
+
+    stats: dict[tuple[int, date], DayStats] = {
+        (staff_id, day): DayStats() for staff_id, days in days_by_staff.items() for day in days
+    }
+    schedules = await load_day_schedules(db, staff_ids, date_from, date_to)
+    for key, entries in schedules.items():
+        if key in stats:
+            stats[key].work_minutes = _work_minutes(key[1], entries, tz)
+
+    in_window = and_(Booking.staff_id.in_(staff_ids), Booking.start_at >= window_start, Booking.start_at < window_end)
+    bookings = await db.execute(
+        select(Booking.staff_id, Booking.start_at, Booking.end_at, Booking.status, Booking.total_price).where(
+            in_window, Booking.status != BookingStatus.expired
+        )
+    )
+    for row in bookings:
+        day_stats = stats.get((row.staff_id, row.start_at.astimezone(tz).date()))
+        if day_stats is None:
+            continue
+        day_stats.bookings_count += 1
+        if row.status == BookingStatus.completed:
+            day_stats.completed_count += 1
+        elif row.status == BookingStatus.no_show:
+            day_stats.no_show_count += 1
+        if row.status in BOOKED_STATUSES:
+            day_stats.booked_minutes += _minutes(row.end_at - row.start_at)
+            day_stats.booked_value += row.total_price
+
+    transactions = await db.execute(
+        select(Booking.staff_id, Booking.start_at, Transaction.transaction_type, Transaction.amount)
+        .join(Transaction, Transaction.booking_id == Booking.id)
+        .where(in_window)
+    )
+    for row in transactions:
+        day_stats = stats.get((row.staff_id, row.start_at.astimezone(tz).date()))
+        if day_stats is not None:
+            day_stats.revenue += row.amount if row.transaction_type == TransactionType.payment else -row.amount
+
+    rows = [
+        {"staff_id": staff_id, "day": day, "business_id": business_id}
+        | {column: getattr(day_stats, column) for column in STAT_COLUMNS}
+        for (staff_id, day), day_stats in stats.items()
+    ]
+    insert = upsert_insert(db)(StaffDailyStats)
+    for offset in range(0, len(rows), 1000):
+        statement = insert.values(rows[offset : offset + 1000])
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[StaffDailyStats.staff_id, StaffDailyStats.day],
+                set_={column: statement.excluded[column] for column in STAT_COLUMNS} | {"updated_at": func.now()},
+            )
+        )
+    return len(rows)
+
+
+async def drain_dirty(limit: int) -> int:
+    members = await redis_client.spop(DIRTY_KEY, limit)
+    if not members:
+        return 0
+
+    grouped: dict[int, dict[int, set[date] | None]] = defaultdict(dict)
+    for member in members:
+        business_id, staff_id, day = parse_member(member)
+        days = grouped[business_id].setdefault(staff_id, set())
+        if day is None or days is None:
+            grouped[business_id][staff_id] = None
+        else:
+            days.add(day)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            refreshed = 0
+            for business_id, days_by_staff in grouped.items():
+                refreshed += await refresh_business(db, business_id, days_by_staff)
+            await db.commit()
+    except Exception:
+        await redis_client.sadd(DIRTY_KEY, *members)
+        raise
+    return refreshed
+
+
+async def backfill(db: AsyncSession, business_id: int, date_from: date, date_to: date) -> int:
+    staff_ids = (await db.scalars(select(Staff.id).where(Staff.business_id == business_id))).all()
+    days = {date_from + timedelta(days=offset) for offset in range((date_to - date_from).days + 1)}
+    refreshed = 0
+    for staff_id in staff_ids:
+        refreshed += await refresh_business(db, business_id, {staff_id: days})
+        await db.commit()
+    return refreshed
+
+
+async def load_dashboard(db: AsyncSession, business_id: int, query: DashboardQuery) -> DashboardOut:
+    totals = [func.coalesce(func.sum(getattr(StaffDailyStats, column)), 0).label(column) for column in STAT_COLUMNS]
+    conditions = [
+        StaffDailyStats.business_id == business_id,
+        StaffDailyStats.day >= query.date_from,
+        StaffDailyStats.day <= query.date_to,
+    ]
+    if query.staff_id is not None:
+        conditions.append(StaffDailyStats.staff_id == query.staff_id)
+
+    def stats(row) -> dict:
+        return {column: getattr(row, column) for column in STAT_COLUMNS}
+
+    by_day = await db.execute(
+        select(StaffDailyStats.day, *totals).where(*conditions).group_by(StaffDailyStats.day).order_by(StaffDailyStats.day)
+    )
+    by_staff = await db.execute(
+        select(StaffDailyStats.staff_id, *totals)
+        .where(*conditions)
+        .group_by(StaffDailyStats.staff_id)
+        .order_by(StaffDailyStats.staff_id)
+    )
+    overall = (await db.execute(select(*totals).where(*conditions))).one()
+    return DashboardOut(
+        business_id=business_id,
+        date_from=query.date_from,
+        date_to=query.date_to,
+        totals=StatsOut(**stats(overall)),
+        by_day=[DayStatsOut(day=row.day, **stats(row)) for row in by_day],
+        by_staff=[StaffStatsOut(staff_id=row.staff_id, **stats(row)) for row in by_staff],
+    )
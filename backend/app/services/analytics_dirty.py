@@ -0,0 +1,31 @@
+import logging
+from collections.abc import Iterable
+from datetime import date
+
+from redis.exceptions import RedisError
+
+from app.db.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+DIRTY_KEY = "analytics:dirty"
+ALL_DAYS = "*"
+
+
+async def mark_dirty(business_id: int, staff_id: int, days: Iterable[date] | None) -> None:
+    if days is None:
+        members = [f"{business_id}:{staff_id}:{ALL_DAYS}"]
+    else:
+        members = [f"{business_id}:{staff_id}:{day.isoformat()}" for day in days]
+    if not members:
+        return
+
+    try:
+        await redis_client.sadd(DIRTY_KEY, *members)
+    except RedisError as exc:
+        logger.warning("Analytics dirty mark failed: %s", exc)
+
+
+def parse_member(member: str) -> tuple[int, int, date | None]:
+    business_id, staff_id, day = member.split(":")
+    return int(business_id), int(staff_id), None if day == ALL_DAYS else date.fromisoformat(day)
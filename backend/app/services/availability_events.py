@@ -0,0 +1,147 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+
+from redis.exceptions import RedisError
+
+from app.core.metrics import AVAILABILITY_SUBSCRIBERS
+from app.db.redis import redis_client
+from app.services import reference_cache, schedule_templates
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "availability:changes"
+RECONNECT_DELAY_SECONDS = 1.0
+REFERENCE_INVALIDATORS = {
+    "business": reference_cache.invalidate_business,
+    "service": reference_cache.invalidate_service,
+}
+
+
+class Subscription:
+    def __init__(self, business_id: int, staff_id: int) -> None:
+        self.business_id = business_id
+        self.staff_id = staff_id
+        self.changed = asyncio.Event()
+        self._days: set[date] = set()
+        self._all_days = False
+
+    def notify(self, days: list[date] | None) -> None:
+        if days is None:
+            self._all_days = True
+        else:
+            self._days.update(days)
+        self.changed.set()
+
+    def take_changes(self) -> set[date] | None:
+        self.changed.clear()
+        days = None if self._all_days else self._days
+        self._days = set()
+        self._all_days = False
+        return days
+
+
+class AvailabilityHub:
+    def __init__(self) -> None:
+        self._subscriptions: dict[tuple[int, int], set[Subscription]] = defaultdict(set)
+        self._listener: asyncio.Task | None = None
+        self._ready = asyncio.Event()
+
+    async def subscribe(self, business_id: int, staff_id: int) -> Subscription:
+        subscription = Subscription(business_id, staff_id)
+        self._subscriptions[(business_id, staff_id)].add(subscription)
+        AVAILABILITY_SUBSCRIBERS.inc()
+        self.start()
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=RECONNECT_DELAY_SECONDS)
+        except TimeoutError:
+            logger.warning("Availability listener is not connected; live updates may be delayed")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        key = (subscription.business_id, subscription.staff_id)
+        subscribers = self._subscriptions.get(key)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscriptions[key]
+        AVAILABILITY_SUBSCRIBERS.dec()
+
+    def start(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+            self._ready.clear()
+
+    def _dispatch(self, raw: str) -> None:
+        event = json.loads(raw)
+        if "reference" in event:
+            REFERENCE_INVALIDATORS[event["reference"]](event["id"])
+            return
+        days = None if event["days"] is None else [date.fromisoformat(day) for day in event["days"]]
+        if days is None:
+            schedule_templates.invalidate_staff(event["staff_id"])
+        for subscription in self._subscriptions.get((event["business_id"], event["staff_id"]), ()):
+            subscription.notify(days)
+
+    def _notify_all(self) -> None:
+        for subscribers in self._subscriptions.values():
+            for subscription in subscribers:
+                subscription.notify(None)
+
+    async def _listen(self) -> None:
+        reconnecting = False
+        while True:
+            try:
+                async with redis_client.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(CHANNEL)
+                    self._ready.set()
+                    if reconnecting:
+                        reference_cache.clear()
+                        schedule_templates.clear()
+                        self._notify_all()
+                        reconnecting = False
+                    while True:
+                        message = await pubsub.get_message(timeout=RECONNECT_DELAY_SECONDS)
+                        if message is not None:
+                            self._dispatch(message["data"])
+            except RedisError as exc:
+                logger.warning("Availability listener disconnected: %s", exc)
+                self._ready.clear()
+                reconnecting = True
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+
+hub = AvailabilityHub()
+
+
+async def publish_change(business_id: int, staff_id: int, days: Iterable[date] | None) -> None:
+    payload = {
+        "business_id": business_id,
+        "staff_id": staff_id,
+        "days": None if days is None else sorted(day.isoformat() for day in days),
+    }
+    try:
+        await redis_client.publish(CHANNEL, json.dumps(payload))
+    except RedisError as exc:
+        logger.warning("Availability publish failed: %s", exc)
+
+
+async def publish_reference_change(kind: str, object_id: int) -> None:
+    REFERENCE_INVALIDATORS[kind](object_id)
+    try:
+        await redis_client.publish(CHANNEL, json.dumps({"reference": kind, "id": object_id}))
+    except RedisError as exc:
+        logger.warning("Reference cache publish failed: %s", exc)
@@ -0,0 +1,52 @@
+from collections import defaultdict
+from datetime import UTC, date, datetime, timedelta
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import Booking, BookingStatus
+from app.services import reference_cache, slot_cache
+
+
+def pending_status_clause():
+    # Rendered as a literal so generic plans still match the partial pending index.
+    return Booking.status == bindparam("pending_status", BookingStatus.pending, literal_execute=True)
+
+
+async def expire_batch(db: AsyncSession, cutoff: datetime, limit: int) -> int:
+    locked = (
+        select(Booking.id)
+        .where(pending_status_clause(), Booking.created_at < cutoff)
+        .order_by(Booking.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    rows = (
+        await db.execute(
+            update(Booking)
+            .where(Booking.id.in_(locked.scalar_subquery()), pending_status_clause())
+            .values(status=BookingStatus.expired)
+            .returning(Booking.business_id, Booking.staff_id, Booking.start_at, Booking.end_at)
+            .execution_options(synchronize_session=False)
+        )
+    ).all()
+    await db.commit()
+
+    freed: dict[tuple[int, int], set[date]] = defaultdict(set)
+    for row in rows:
+        business = await reference_cache.get_business(db, row.business_id)
+        freed[row.business_id, row.staff_id].update(slot_cache.booking_days(row.start_at, row.end_at, business.timezone))
+    for (business_id, staff_id), days in freed.items():
+        await slot_cache.invalidate_days(business_id, staff_id, sorted(days))
+    return len(rows)
+
+
+async def expire_pending_bookings(db: AsyncSession, now: datetime | None = None) -> int:
+    cutoff = (now or datetime.now(UTC)) - timedelta(minutes=settings.pending_booking_payment_window_minutes)
+    expired = 0
+    while True:
+        count = await expire_batch(db, cutoff, settings.pending_booking_sweep_batch_size)
+        expired += count
+        if count < settings.pending_booking_sweep_batch_size:
+            return expired
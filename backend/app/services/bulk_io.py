@@ -0,0 +1,264 @@
+import csv
+import io
+import json
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from datetime import date, time
+from enum import Enum
+
+from asyncpg import PostgresError
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Select, Table, insert, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models import Schedule, Service, Staff
+from app.schemas.bulk import (
+    BulkFormat,
+    BulkKind,
+    ImportReport,
+    ImportRowError,
+    ScheduleImportRow,
+    ServiceImportRow,
+    StaffImportRow,
+)
+from app.services import slot_cache
+
+MAX_REPORTED_ERRORS = 1000
+
+
+@dataclass(frozen=True)
+class BulkSpec:
+    table: Table
+    row_model: type[BaseModel]
+    columns: tuple[str, ...]
+    export_columns: tuple[str, ...]
+
+
+BULK_SPECS = {
+    BulkKind.staff: BulkSpec(
+        Staff.__table__,
+        StaffImportRow,
+        ("business_id", "full_name", "role", "avatar_url", "bio", "is_active"),
+        ("id", "full_name", "role", "avatar_url", "bio", "is_active"),
+    ),
+    BulkKind.services: BulkSpec(
+        Service.__table__,
+        ServiceImportRow,
+        ("business_id", "name", "price", "duration_minutes", "category_id", "is_active"),
+        ("id", "name", "price", "duration_minutes", "category_id", "is_active"),
+    ),
+    BulkKind.schedules: BulkSpec(
+        Schedule.__table__,
+        ScheduleImportRow,
+        ("staff_id", "schedule_type", "day", "start_time", "end_time"),
+        ("id", "staff_id", "schedule_type", "day", "start_time", "end_time"),
+    ),
+}
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8-sig").rstrip("\r")
+
+
+async def iter_records(chunks: AsyncIterator[bytes], fmt: BulkFormat) -> AsyncIterator[tuple[int, dict | str]]:
+    if fmt == BulkFormat.jsonl:
+        line_number = 0
+        async for line in _iter_lines(chunks):
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_number, f"Invalid JSON: {exc.msg}"
+                continue
+            yield line_number, record if isinstance(record, dict) else "Expected a JSON object"
+        return
+
+    header: list[str] | None = None
+    pending, pending_start, line_number = "", 0, 0
+    async for line in _iter_lines(chunks):
+        line_number += 1
+        if not pending:
+            pending_start = line_number
+            pending = line
+        else:
+            pending = f"{pending}\n{line}"
+        if pending.count('"') % 2:
+            continue
+
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield pending_start, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield pending_start, {name: value for name, value in zip(header, values) if value != ""}
+
+    if pending:
+        yield pending_start, "Unterminated quoted field"
+
+
+def _record_values(spec: BulkSpec, business_id: int, row: BaseModel) -> dict:
+    values = row.model_dump()
+    if "business_id" in spec.columns:
+        values["business_id"] = business_id
+    return {
+        column: values[column].value if isinstance(values[column], Enum) else values[column] for column in spec.columns
+    }
+
+
+async def _insert_rows(db: AsyncSession, spec: BulkSpec, rows: list[dict]) -> None:
+    await db.execute(insert(spec.table), rows)
+
+
+async def _copy_rows(db: AsyncSession, spec: BulkSpec, rows: list[dict]) -> None:
+    if db.get_bind().dialect.name != "postgresql":
+        await _insert_rows(db, spec, rows)
+        return
+
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        spec.table.name, records=[tuple(row.values()) for row in rows], columns=list(spec.columns)
+    )
+
+
+async def _flush(
+    db: AsyncSession, spec: BulkSpec, chunk: list[tuple[int, dict]], errors: list[ImportRowError]
+) -> list[dict]:
+    try:
+        async with db.begin_nested():
+            await _copy_rows(db, spec, [row for _, row in chunk])
+        return [row for _, row in chunk]
+    except (DBAPIError, PostgresError):
+        pass
+
+    loaded = []
+    for line_number, row in chunk:
+        try:
+            async with db.begin_nested():
+                await _insert_rows(db, spec, [row])
+            loaded.append(row)
+        except DBAPIError as exc:
+            errors.append(ImportRowError(line=line_number, error=str(exc.orig).splitlines()[0]))
+    return loaded
+
+
+async def import_rows(
+    db: AsyncSession,
+    business_id: int,
+    kind: BulkKind,
+    records: AsyncIterator[tuple[int, dict | str]],
+) -> ImportReport:
+    spec = BULK_SPECS[kind]
+    staff_ids: set[int] = set()
+    if kind == BulkKind.schedules:
+        staff_ids = set((await db.scalars(select(Staff.id).where(Staff.business_id == business_id))).all())
+
+    errors: list[ImportRowError] = []
+    chunk: list[tuple[int, dict]] = []
+    imported = 0
+    touched_days: dict[int, set[date]] = defaultdict(set)
+
+    async def flush() -> None:
+        nonlocal imported
+        loaded = await _flush(db, spec, chunk, errors)
+        imported += len(loaded)
+        if kind == BulkKind.schedules:
+            for row in loaded:
+                touched_days[row["staff_id"]].add(row["day"])
+        chunk.clear()
+
+    async for line_number, record in records:
+        if isinstance(record, str):
+            errors.append(ImportRowError(line=line_number, error=record))
+            continue
+        try:
+            row = spec.row_model.model_validate(record)
+        except ValidationError as exc:
+            errors.append(ImportRowError(line=line_number, error=_format_validation_error(exc)))
+            continue
+        if kind == BulkKind.schedules and row.staff_id not in staff_ids:
+            errors.append(ImportRowError(line=line_number, error=f"Unknown staff_id {row.staff_id}"))
+            continue
+
+        chunk.append((line_number, _record_values(spec, business_id, row)))
+        if len(chunk) >= settings.bulk_import_chunk_size:
+            await flush()
+
+    if chunk:
+        await flush()
+    await db.commit()
+
+    for staff_id, days in touched_days.items():
+        await slot_cache.invalidate_days(business_id, staff_id, days)
+
+    errors.sort(key=lambda error: error.line)
+    return ImportReport(imported=imported, failed=len(errors), errors=errors[:MAX_REPORTED_ERRORS])
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    )
+
+
+def export_query(business_id: int, kind: BulkKind) -> Select:
+    spec = BULK_SPECS[kind]
+    columns = [spec.table.c[name] for name in spec.export_columns]
+    if kind == BulkKind.schedules:
+        return (
+            select(*columns)
+            .join(Staff, Staff.id == Schedule.staff_id)
+            .where(Staff.business_id == business_id)
+            .order_by(Schedule.staff_id, Schedule.day, Schedule.start_time)
+        )
+    return select(*columns).where(spec.table.c.business_id == business_id).order_by(spec.table.c.id)
+
+
+def _cell(value):
+    if isinstance(value, Enum):
+        return value.value
+    if value is None or isinstance(value, bool | int | str):
+        return value
+    if isinstance(value, date | time):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_rows(columns: tuple[str, ...], rows: Iterable, fmt: BulkFormat) -> str:
+    if fmt == BulkFormat.jsonl:
+        return "".join(json.dumps(dict(zip(columns, map(_cell, row))), ensure_ascii=False) + "\n" for row in rows)
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows([_cell(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+async def export_rows(business_id: int, kind: BulkKind, fmt: BulkFormat) -> AsyncIterator[str]:
+    columns = BULK_SPECS[kind].export_columns
+    if fmt == BulkFormat.csv:
+        yield encode_rows((), [columns], fmt)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(
+            export_query(business_id, kind).execution_options(yield_per=settings.bulk_export_batch_size)
+        )
+        async for partition in result.partitions():
+            yield encode_rows(columns, partition, fmt)
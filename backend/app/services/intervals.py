@@ -0,0 +1,31 @@
+from collections.abc import Iterable
+from datetime import datetime
+
+Interval = tuple[datetime, datetime]
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(ranges: Iterable[Interval], blocked: Iterable[Interval]) -> list[Interval]:
+    remaining: list[Interval] = []
+    blocked_ranges = merge_intervals(blocked)
+    for start, end in merge_intervals(ranges):
+        cursor = start
+        for blocked_start, blocked_end in blocked_ranges:
+            if blocked_end <= cursor or blocked_start >= end:
+                continue
+            if blocked_start > cursor:
+                remaining.append((cursor, blocked_start))
+            cursor = max(cursor, blocked_end)
+        if cursor < end:
+            remaining.append((cursor, end))
+    return remaining
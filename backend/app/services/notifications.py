@@ -0,0 +1,118 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from enum import StrEnum
+
+from sqlalchemy import and_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import NOTIFICATIONS_SENT
+from app.db.session import AsyncSessionLocal
+from app.models import Booking, BookingStatus, Business, Client, Service, Staff
+from app.services import reference_cache
+from app.services.telegram_bot import DeliveryResult, TelegramBot
+
+
+class NotificationKind(StrEnum):
+    confirmation = "confirmation"
+    reminder = "reminder"
+
+
+SENT_COLUMNS = {
+    NotificationKind.confirmation: Booking.confirmation_sent_at,
+    NotificationKind.reminder: Booking.reminder_sent_at,
+}
+NOTIFIED_STATUSES = {
+    NotificationKind.confirmation: (BookingStatus.confirmed, BookingStatus.paid),
+    NotificationKind.reminder: (BookingStatus.confirmed, BookingStatus.paid),
+}
+
+
+def due_condition(kind: NotificationKind, now: datetime):
+    condition = and_(SENT_COLUMNS[kind].is_(None), Booking.start_at > now, Booking.status.in_(NOTIFIED_STATUSES[kind]))
+    if kind == NotificationKind.reminder:
+        condition = and_(condition, Booking.start_at <= now + timedelta(minutes=settings.notification_reminder_lead_minutes))
+    return condition
+
+
+async def claim_due(db: AsyncSession, kind: NotificationKind, now: datetime, limit: int) -> list[int]:
+    column = SENT_COLUMNS[kind]
+    locked = (
+        select(Booking.id)
+        .where(due_condition(kind, now))
+        .order_by(Booking.start_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = await db.scalars(
+        update(Booking)
+        .where(Booking.id.in_(locked.scalar_subquery()), column.is_(None))
+        .values({column: now})
+        .returning(Booking.id)
+        .execution_options(synchronize_session=False)
+    )
+    booking_ids = list(claimed.all())
+    await db.commit()
+    return booking_ids
+
+
+def _when(start_at: datetime, now: datetime, tz) -> str:
+    local_start = start_at.astimezone(tz)
+    days_ahead = (local_start.date() - now.astimezone(tz).date()).days
+    day = {0: "today", 1: "tomorrow"}.get(days_ahead, f"on {local_start:%d.%m}")
+    return f"{day} at {local_start:%H:%M}"
+
+
+def render(kind: NotificationKind, row, now: datetime) -> str:
+    when = _when(row.start_at, now, reference_cache.get_zoneinfo(row.timezone))
+    if kind == NotificationKind.confirmation:
+        return f"Your booking at {row.business_name} is confirmed: {row.service_name} with {row.staff_name} {when}."
+    return f"Reminder: {row.service_name} with {row.staff_name} at {row.business_name} {when}."
+
+
+async def dispatch_batch(bot: TelegramBot, kind: NotificationKind, now: datetime | None = None) -> dict[str, int]:
+    now = now or datetime.now(UTC)
+    counts = {"skipped": 0} | {result.value: 0 for result in DeliveryResult}
+    async with AsyncSessionLocal() as db:
+        booking_ids = await claim_due(db, kind, now, settings.notification_batch_size)
+        if not booking_ids:
+            return counts
+        rows = (
+            await db.execute(
+                select(
+                    Booking.id,
+                    Booking.start_at,
+                    Client.telegram_id,
+                    Service.name.label("service_name"),
+                    Staff.full_name.label("staff_name"),
+                    Business.name.label("business_name"),
+                    Business.timezone,
+                )
+                .join(Service, Service.id == Booking.service_id)
+                .join(Staff, Staff.id == Booking.staff_id)
+                .join(Business, Business.id == Booking.business_id)
+                .outerjoin(Client, Client.id == Booking.client_id)
+                .where(Booking.id.in_(booking_ids))
+            )
+        ).all()
+
+    recipients = [row for row in rows if row.telegram_id is not None]
+    counts["skipped"] = len(rows) - len(recipients)
+    results = await asyncio.gather(*(bot.send_message(row.telegram_id, render(kind, row, now)) for row in recipients))
+
+    retry_ids = []
+    for row, result in zip(recipients, results):
+        counts[result.value] += 1
+        NOTIFICATIONS_SENT.labels(kind.value, result.value).inc()
+        if result == DeliveryResult.failed:
+            retry_ids.append(row.id)
+    if retry_ids:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Booking)
+                .where(Booking.id.in_(retry_ids))
+                .values({SENT_COLUMNS[kind]: None})
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+    return counts
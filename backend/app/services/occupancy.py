@@ -0,0 +1,103 @@
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from app.services.intervals import Interval
+
+MINUTES_PER_DAY = 24 * 60
+
+
+@dataclass(frozen=True, slots=True)
+class DayOccupancy:
+    work: tuple[tuple[int, int], ...]
+    blocked: int
+
+
+def _minute(moment: datetime, midnight: datetime, tz: ZoneInfo, round_up: bool) -> int:
+    minutes = (moment.astimezone(tz).replace(tzinfo=None) - midnight).total_seconds() / 60
+    return min(max(math.ceil(minutes) if round_up else math.floor(minutes), 0), MINUTES_PER_DAY)
+
+
+def build(day: date, work_ranges: Iterable[Interval], blocked_ranges: Iterable[Interval], tz: ZoneInfo) -> DayOccupancy:
+    midnight = datetime.combine(day, time.min)
+    work = []
+    for start, end in sorted(work_ranges):
+        first, last = _minute(start, midnight, tz, True), _minute(end, midnight, tz, False)
+        if first < last:
+            work.append((first, last))
+
+    blocked = 0
+    for start, end in blocked_ranges:
+        first, last = _minute(start, midnight, tz, False), _minute(end, midnight, tz, True)
+        if first < last:
+            blocked |= ((1 << (last - first)) - 1) << first
+    return DayOccupancy(work=tuple(work), blocked=blocked)
+
+
+def encode(occupancy: DayOccupancy) -> str:
+    work = ",".join(f"{start}-{end}" for start, end in occupancy.work)
+    return f"{work}|{occupancy.blocked:x}"
+
+
+def decode(raw: str) -> DayOccupancy:
+    work, blocked = raw.split("|")
+    return DayOccupancy(
+        work=tuple((int(start), int(end)) for start, end in (item.split("-") for item in work.split(",") if item)),
+        blocked=int(blocked, 16),
+    )
+
+
+@lru_cache(maxsize=64)
+def _step_mask(step_minutes: int) -> int:
+    mask = 0
+    for minute in range(0, MINUTES_PER_DAY, step_minutes):
+        mask |= 1 << minute
+    return mask
+
+
+def _fitting_starts(free: int, duration_minutes: int) -> int:
+    covered = 1
+    while covered < duration_minutes:
+        shift = min(covered, duration_minutes - covered)
+        free &= free >> shift
+        covered += shift
+    return free
+
+
+def free_slots(
+    occupancy: DayOccupancy,
+    day: date,
+    tz: ZoneInfo,
+    duration_minutes: int,
+    step_minutes: int,
+) -> list[Interval]:
+    midnight = datetime.combine(day, time.min, tzinfo=tz)
+    duration = timedelta(minutes=duration_minutes)
+    free = ~occupancy.blocked
+    slots: list[Interval] = []
+    for work_start, work_end in occupancy.work:
+        if work_end - work_start < duration_minutes:
+            continue
+        window = (free >> work_start) & ((1 << (work_end - work_start)) - 1)
+        starts = _fitting_starts(window, duration_minutes) & _step_mask(step_minutes)
+        while starts:
+            lowest = starts & -starts
+            start = midnight + timedelta(minutes=work_start + lowest.bit_length() - 1)
+            slots.append((start, start + duration))
+            starts ^= lowest
+    return slots
+
+
+def local_minute(moment: datetime, tz: ZoneInfo) -> tuple[date, int]:
+    local = moment.astimezone(tz)
+    return local.date(), local.hour * 60 + local.minute
+
+
+def fits(occupancy: DayOccupancy, start_minute: int, duration_minutes: int) -> bool:
+    end_minute = start_minute + duration_minutes
+    if not any(work_start <= start_minute and end_minute <= work_end for work_start, work_end in occupancy.work):
+        return False
+    return not (occupancy.blocked >> start_minute) & ((1 << duration_minutes) - 1)
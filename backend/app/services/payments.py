@@ -0,0 +1,149 @@
+import logging
+from dataclasses import dataclass
+from decimal import Decimal
+from enum import StrEnum
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.dialects import upsert_insert
+from app.models import Booking, BookingStatus, PaymentMethod, Transaction, TransactionType
+from app.services import analytics_dirty, reference_cache, slot_cache
+from app.services.slot_finder import blocking_changed
+
+logger = logging.getLogger(__name__)
+
+YOOKASSA_STATUS_TRANSITIONS = {
+    "succeeded": (BookingStatus.paid, TransactionType.payment),
+    "canceled": (BookingStatus.confirmed, TransactionType.refund),
+}
+
+
+class InvalidPaymentEvent(ValueError):
+    pass
+
+
+class EventOutcome(StrEnum):
+    applied = "applied"
+    duplicate = "duplicate"
+    ignored = "ignored"
+    booking_not_found = "booking_not_found"
+
+
+@dataclass(frozen=True, slots=True)
+class PaymentEvent:
+    payment_id: str
+    status: str
+    amount: Decimal
+    booking_id: int
+
+
+def parse_yookassa_event(event: dict) -> PaymentEvent:
+    obj = event.get("object", {})
+    payment_id = obj.get("id")
+    booking_id = obj.get("metadata", {}).get("booking_id")
+    if not payment_id or not booking_id:
+        raise InvalidPaymentEvent("Invalid payment payload")
+
+    try:
+        return PaymentEvent(
+            payment_id=payment_id,
+            status=obj.get("status"),
+            amount=Decimal(obj.get("amount", {}).get("value", "0")),
+            booking_id=int(booking_id),
+        )
+    except (ArithmeticError, ValueError) as exc:
+        raise InvalidPaymentEvent("Invalid payment payload") from exc
+
+
+async def apply_yookassa_events(db: AsyncSession, events: list[PaymentEvent]) -> list[EventOutcome]:
+    outcomes: list[EventOutcome | None] = [None] * len(events)
+    first_by_payment: dict[str, int] = {}
+    for index, event in enumerate(events):
+        if event.status not in YOOKASSA_STATUS_TRANSITIONS:
+            outcomes[index] = EventOutcome.ignored
+        elif event.payment_id in first_by_payment:
+            outcomes[index] = EventOutcome.duplicate
+        else:
+            first_by_payment[event.payment_id] = index
+
+    candidates = [events[index] for index in first_by_payment.values()]
+    bookings = {}
+    if candidates:
+        rows = await db.execute(
+            select(Booking.id, Booking.business_id, Booking.staff_id, Booking.start_at, Booking.end_at, Booking.status)
+            .where(Booking.id.in_({event.booking_id for event in candidates}))
+            .with_for_update()
+        )
+        bookings = {row.id: row for row in rows}
+
+    rows_to_insert = []
+    for index in first_by_payment.values():
+        event = events[index]
+        if event.booking_id not in bookings:
+            outcomes[index] = EventOutcome.booking_not_found
+            continue
+        rows_to_insert.append(
+            {
+                "booking_id": event.booking_id,
+                "amount": event.amount,
+                "transaction_type": YOOKASSA_STATUS_TRANSITIONS[event.status][1],
+                "payment_method": PaymentMethod.yookassa,
+                "external_payment_id": event.payment_id,
+            }
+        )
+
+    inserted: set[str] = set()
+    if rows_to_insert:
+        statement = (
+            upsert_insert(db)(Transaction)
+            .values(rows_to_insert)
+            .on_conflict_do_nothing(index_elements=[Transaction.external_payment_id])
+            .returning(Transaction.external_payment_id)
+        )
+        inserted = set((await db.scalars(statement)).all())
+
+    new_statuses: dict[int, BookingStatus] = {}
+    expired_payments: dict[str, int] = {}
+    for payment_id, index in first_by_payment.items():
+        if outcomes[index] is not None:
+            continue
+        if payment_id in inserted:
+            outcomes[index] = EventOutcome.applied
+            if bookings[events[index].booking_id].status == BookingStatus.expired:
+                expired_payments[payment_id] = events[index].booking_id
+            else:
+                new_statuses[events[index].booking_id] = YOOKASSA_STATUS_TRANSITIONS[events[index].status][0]
+        else:
+            outcomes[index] = EventOutcome.duplicate
+
+    by_status: dict[BookingStatus, list[int]] = {}
+    for booking_id, status in new_statuses.items():
+        by_status.setdefault(status, []).append(booking_id)
+    for status, booking_ids in by_status.items():
+        await db.execute(
+            update(Booking).where(Booking.id.in_(booking_ids)).values(status=status).execution_options(synchronize_session=False)
+        )
+    await db.commit()
+
+    for booking_id, status in new_statuses.items():
+        booking = bookings[booking_id]
+        business = await reference_cache.get_business(db, booking.business_id)
+        if blocking_changed(booking.status, status):
+            await slot_cache.invalidate_booking(
+                booking.business_id, booking.staff_id, booking.start_at, booking.end_at, business.timezone
+            )
+        else:
+            await analytics_dirty.mark_dirty(
+                booking.business_id, booking.staff_id, slot_cache.booking_days(booking.start_at, booking.end_at, business.timezone)
+            )
+
+    for payment_id, booking_id in expired_payments.items():
+        booking = bookings[booking_id]
+        logger.warning("Payment %s recorded for expired booking %s; needs manual review or refund", payment_id, booking_id)
+        business = await reference_cache.get_business(db, booking.business_id)
+        await analytics_dirty.mark_dirty(
+            booking.business_id, booking.staff_id, slot_cache.booking_days(booking.start_at, booking.end_at, business.timezone)
+        )
+
+    return outcomes
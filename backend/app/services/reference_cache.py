@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import MEMORY_CACHES
+from app.models import Business, Service
+
+
+@dataclass(frozen=True, slots=True)
+class BusinessInfo:
+    id: int
+    timezone: ZoneInfo
+    currency: str
+
+
+@dataclass(frozen=True, slots=True)
+class ServiceInfo:
+    id: int
+    business_id: int
+    price: Decimal
+    duration_minutes: int
+    is_active: bool
+
+
+_businesses: TTLCache[int, BusinessInfo] = TTLCache(settings.reference_cache_maxsize, settings.reference_cache_ttl_seconds)
+_services: TTLCache[int, ServiceInfo] = TTLCache(settings.reference_cache_maxsize, settings.reference_cache_ttl_seconds)
+
+
+@lru_cache(maxsize=128)
+def get_zoneinfo(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
+async def get_business(db: AsyncSession, business_id: int) -> BusinessInfo | None:
+    cached = _businesses.get(business_id)
+    if cached:
+        return cached
+
+    row = (
+        await db.execute(select(Business.id, Business.timezone, Business.currency).where(Business.id == business_id))
+    ).first()
+    if not row:
+        return None
+
+    business = BusinessInfo(id=row.id, timezone=get_zoneinfo(row.timezone), currency=row.currency)
+    _businesses.set(business_id, business)
+    return business
+
+
+async def get_service(db: AsyncSession, business_id: int, service_id: int) -> ServiceInfo | None:
+    cached = _services.get(service_id)
+    if not cached:
+        row = (
+            await db.execute(
+                select(Service.id, Service.business_id, Service.price, Service.duration_minutes, Service.is_active).where(
+                    Service.id == service_id
+                )
+            )
+        ).first()
+        if not row:
+            return None
+        cached = ServiceInfo(
+            id=row.id,
+            business_id=row.business_id,
+            price=row.price,
+            duration_minutes=row.duration_minutes,
+            is_active=row.is_active,
+        )
+        _services.set(service_id, cached)
+
+    return cached if cached.business_id == business_id else None
+
+
+def invalidate_business(business_id: int) -> None:
+    _businesses.pop(business_id)
+
+
+def invalidate_service(service_id: int) -> None:
+    _services.pop(service_id)
+
+
+def clear() -> None:
+    _businesses.clear()
+    _services.clear()
+    get_zoneinfo.cache_clear()
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    zone_info = get_zoneinfo.cache_info()
+    return {
+        "businesses": _businesses.stats(),
+        "services": _services.stats(),
+        "zoneinfo": {"size": zone_info.currsize, "hits": zone_info.hits, "misses": zone_info.misses},
+    }
+
+
+MEMORY_CACHES.add_source(cache_stats)
@@ -0,0 +1,87 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import MEMORY_CACHES
+from app.models import Schedule, ScheduleTemplate, ScheduleType
+
+
+@dataclass(frozen=True, slots=True)
+class TemplateEntry:
+    schedule_type: ScheduleType
+    start_time: time
+    end_time: time
+    valid_from: date
+    valid_until: date | None
+
+    def applies_to(self, day: date) -> bool:
+        return self.valid_from <= day and (self.valid_until is None or day <= self.valid_until)
+
+
+WeeklyTemplate = dict[int, tuple[TemplateEntry, ...]]
+
+_templates: TTLCache[int, WeeklyTemplate] = TTLCache(
+    settings.reference_cache_maxsize, settings.schedule_template_cache_ttl_seconds
+)
+
+
+async def load_weekly_templates(db: AsyncSession, staff_ids: list[int]) -> dict[int, WeeklyTemplate]:
+    weekly: dict[int, WeeklyTemplate] = {}
+    missing = []
+    for staff_id in staff_ids:
+        cached = _templates.get(staff_id)
+        if cached is None:
+            missing.append(staff_id)
+        else:
+            weekly[staff_id] = cached
+
+    if missing:
+        rows = (
+            await db.scalars(
+                select(ScheduleTemplate)
+                .where(ScheduleTemplate.staff_id.in_(missing))
+                .order_by(ScheduleTemplate.staff_id, ScheduleTemplate.weekday, ScheduleTemplate.start_time)
+            )
+        ).all()
+        grouped: dict[int, dict[int, list[TemplateEntry]]] = defaultdict(lambda: defaultdict(list))
+        for row in rows:
+            grouped[row.staff_id][row.weekday].append(
+                TemplateEntry(row.schedule_type, row.start_time, row.end_time, row.valid_from, row.valid_until)
+            )
+        for staff_id in missing:
+            weekly[staff_id] = {weekday: tuple(entries) for weekday, entries in grouped[staff_id].items()}
+            _templates.set(staff_id, weekly[staff_id])
+
+    return weekly
+
+
+def expand_day(weekly: WeeklyTemplate, day: date) -> list[TemplateEntry]:
+    return [entry for entry in weekly.get(day.weekday(), ()) if entry.applies_to(day)]
+
+
+def apply_exceptions(
+    template_entries: list[TemplateEntry], exceptions: list[Schedule]
+) -> list[Schedule | TemplateEntry]:
+    if any(entry.schedule_type == ScheduleType.work for entry in exceptions):
+        template_entries = [entry for entry in template_entries if entry.schedule_type != ScheduleType.work]
+    return [*template_entries, *exceptions]
+
+
+def invalidate_staff(staff_id: int) -> None:
+    _templates.pop(staff_id)
+
+
+def clear() -> None:
+    _templates.clear()
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    return {"schedule_templates": _templates.stats()}
+
+
+MEMORY_CACHES.add_source(cache_stats)
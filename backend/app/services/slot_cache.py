@@ -0,0 +1,211 @@
+import json
+import logging
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.metrics import SLOT_CACHE_LOOKUPS, SLOT_OCCUPANCY_LOOKUPS
+from app.db.redis import redis_client
+from app.services import analytics_dirty, availability_events, occupancy
+from app.services.intervals import Interval
+
+logger = logging.getLogger(__name__)
+
+OCCUPANCY_FIELD = "occupancy"
+
+_STORE_IF_GENERATION_UNCHANGED = redis_client.register_script(
+    """
+    if (redis.call('GET', KEYS[1]) or '0') ~= ARGV[1] then
+        return 0
+    end
+    for i = 2, #KEYS do
+        redis.call('HSET', KEYS[i], ARGV[3], ARGV[i + 2])
+        redis.call('EXPIRE', KEYS[i], ARGV[2])
+    end
+    return 1
+    """
+)
+
+
+def _generation_key(business_id: int, staff_id: int) -> str:
+    return f"slots:{{{business_id}:{staff_id}}}:gen"
+
+
+def _day_key(business_id: int, staff_id: int, day: date) -> str:
+    return f"slots:{{{business_id}:{staff_id}}}:{day.isoformat()}"
+
+
+def _occupancy_key(business_id: int, staff_id: int, day: date) -> str:
+    return f"slots:{{{business_id}:{staff_id}}}:occupancy:{day.isoformat()}"
+
+
+def _field(service_id: int, step_minutes: int) -> str:
+    return f"{service_id}:{step_minutes}"
+
+
+def _encode(slots: list[Interval]) -> str:
+    return json.dumps([[start.isoformat(), end.isoformat()] for start, end in slots])
+
+
+def _decode(raw: str) -> list[Interval]:
+    return [(datetime.fromisoformat(start), datetime.fromisoformat(end)) for start, end in json.loads(raw)]
+
+
+def booking_days(start_at: datetime, end_at: datetime, tz: ZoneInfo) -> list[date]:
+    first, last = start_at.astimezone(tz).date(), end_at.astimezone(tz).date()
+    return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+
+async def get_cached_days(
+    business_id: int,
+    staff_id: int,
+    service_id: int,
+    step_minutes: int,
+    days: list[date],
+) -> tuple[str | None, dict[date, list[Interval]]]:
+    if not settings.slot_cache_enabled:
+        return None, {}
+
+    field = _field(service_id, step_minutes)
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.get(_generation_key(business_id, staff_id))
+            for day in days:
+                pipe.hget(_day_key(business_id, staff_id, day), field)
+            generation, *payloads = await pipe.execute()
+    except RedisError as exc:
+        logger.warning("Slot cache read failed: %s", exc)
+        return None, {}
+
+    cached = {day: _decode(raw) for day, raw in zip(days, payloads) if raw is not None}
+    SLOT_CACHE_LOOKUPS.labels("hit").inc(len(cached))
+    SLOT_CACHE_LOOKUPS.labels("miss").inc(len(days) - len(cached))
+    return generation or "0", cached
+
+
+async def store_days(
+    business_id: int,
+    staff_id: int,
+    service_id: int,
+    step_minutes: int,
+    generation: str | None,
+    slots_by_day: dict[date, list[Interval]],
+) -> None:
+    if generation is None or not slots_by_day:
+        return
+
+    keys = [_generation_key(business_id, staff_id)]
+    args: list[str | int] = [generation, settings.slot_cache_ttl_seconds, _field(service_id, step_minutes)]
+    for day, slots in slots_by_day.items():
+        keys.append(_day_key(business_id, staff_id, day))
+        args.append(_encode(slots))
+
+    try:
+        await _STORE_IF_GENERATION_UNCHANGED(keys=keys, args=args)
+    except RedisError as exc:
+        logger.warning("Slot cache write failed: %s", exc)
+
+
+async def get_cached_occupancy(
+    business_id: int,
+    staff_ids: list[int],
+    days: list[date],
+) -> tuple[dict[int, str | None], dict[int, dict[date, occupancy.DayOccupancy]]]:
+    empty: dict[int, dict[date, occupancy.DayOccupancy]] = {staff_id: {} for staff_id in staff_ids}
+    if not settings.slot_cache_enabled:
+        return {}, empty
+
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for staff_id in staff_ids:
+                pipe.get(_generation_key(business_id, staff_id))
+                for day in days:
+                    pipe.hget(_occupancy_key(business_id, staff_id, day), OCCUPANCY_FIELD)
+            replies = await pipe.execute()
+    except RedisError as exc:
+        logger.warning("Occupancy cache read failed: %s", exc)
+        return {}, empty
+
+    generations: dict[int, str | None] = {}
+    cached = empty
+    per_staff = len(days) + 1
+    for index, staff_id in enumerate(staff_ids):
+        generation, *payloads = replies[index * per_staff : (index + 1) * per_staff]
+        generations[staff_id] = generation or "0"
+        cached[staff_id] = {day: occupancy.decode(raw) for day, raw in zip(days, payloads) if raw is not None}
+    hits = sum(len(by_day) for by_day in cached.values())
+    SLOT_OCCUPANCY_LOOKUPS.labels("hit").inc(hits)
+    SLOT_OCCUPANCY_LOOKUPS.labels("miss").inc(len(staff_ids) * len(days) - hits)
+    return generations, cached
+
+
+async def store_occupancy(
+    business_id: int,
+    generations: dict[int, str | None],
+    occupancy_by_staff: dict[int, dict[date, occupancy.DayOccupancy]],
+) -> None:
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for staff_id, by_day in occupancy_by_staff.items():
+                generation = generations.get(staff_id)
+                if generation is None or not by_day:
+                    continue
+                keys = [_generation_key(business_id, staff_id)]
+                args: list[str | int] = [generation, settings.slot_occupancy_ttl_seconds, OCCUPANCY_FIELD]
+                for day, day_occupancy in by_day.items():
+                    keys.append(_occupancy_key(business_id, staff_id, day))
+                    args.append(occupancy.encode(day_occupancy))
+                await _STORE_IF_GENERATION_UNCHANGED(keys=keys, args=args, client=pipe)
+            await pipe.execute()
+    except RedisError as exc:
+        logger.warning("Occupancy cache write failed: %s", exc)
+
+
+async def invalidate_days(business_id: int, staff_id: int, days: Iterable[date]) -> None:
+    days = list(days)
+    if settings.slot_cache_enabled:
+        try:
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.incr(_generation_key(business_id, staff_id))
+                for day in days:
+                    pipe.delete(_day_key(business_id, staff_id, day), _occupancy_key(business_id, staff_id, day))
+                await pipe.execute()
+        except RedisError:
+            logger.error("Slot cache invalidation failed for staff %s", staff_id, exc_info=True)
+
+    await availability_events.publish_change(business_id, staff_id, days)
+    await analytics_dirty.mark_dirty(business_id, staff_id, days)
+
+
+async def invalidate_staff(business_id: int, staff_id: int) -> None:
+    generation_key = _generation_key(business_id, staff_id)
+    if settings.slot_cache_enabled:
+        try:
+            day_keys = [
+                key
+                async for key in redis_client.scan_iter(match=f"slots:{{{business_id}:{staff_id}}}:*", count=500)
+                if key != generation_key
+            ]
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.incr(generation_key)
+                if day_keys:
+                    pipe.delete(*day_keys)
+                await pipe.execute()
+        except RedisError:
+            logger.error("Slot cache invalidation failed for staff %s", staff_id, exc_info=True)
+
+    await availability_events.publish_change(business_id, staff_id, None)
+    await analytics_dirty.mark_dirty(business_id, staff_id, None)
+
+
+async def invalidate_booking(
+    business_id: int,
+    staff_id: int,
+    start_at: datetime,
+    end_at: datetime,
+    tz: ZoneInfo,
+) -> None:
+    await invalidate_days(business_id, staff_id, booking_days(start_at, end_at, tz))
@@ -1,45 +1,148 @@
-from datetime import datetime, timedelta
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from time import perf_counter
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import and_, select
+from sqlalchemy import Select, and_, bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Booking, BookingStatus, Business, Schedule, ScheduleType, Service
+from app.core.metrics import SLOT_COMPUTE_SECONDS, SLOTS_RETURNED
+from app.models import BLOCKING_BOOKING_STATUSES, Booking, BookingStatus, Schedule, ScheduleType, Staff
+from app.services import occupancy, reference_cache, schedule_templates, slot_cache, slot_holds
+from app.services.intervals import Interval
+from app.services.schedule_templates import TemplateEntry
 
-BLOCKING_BOOKING_STATUSES = {
-    BookingStatus.pending,
-    BookingStatus.confirmed,
-    BookingStatus.paid,
-    BookingStatus.completed,
-}
 
+@dataclass(frozen=True, slots=True)
+class ChainLink:
+    service_id: int
+    start_at: datetime
+    end_at: datetime
+    staff_ids: tuple[int, ...]
 
-def _overlaps(candidate_start: datetime, candidate_end: datetime, blocked_start: datetime, blocked_end: datetime) -> bool:
-    return candidate_start < blocked_end and blocked_start < candidate_end
 
+def blocking_changed(old_status: BookingStatus | None, new_status: BookingStatus) -> bool:
+    return (old_status in BLOCKING_BOOKING_STATUSES) != (new_status in BLOCKING_BOOKING_STATUSES)
 
-async def find_free_slots(
-    db: AsyncSession,
-    business_id: int,
-    service_id: int,
-    staff_id: int,
-    day,
-    step_minutes: int = 15,
-) -> list[tuple[datetime, datetime]]:
-    business = await db.scalar(select(Business).where(Business.id == business_id))
-    service = await db.scalar(select(Service).where(and_(Service.id == service_id, Service.business_id == business_id)))
+
+def _available(slots: list[Interval], now: datetime, held: list[Interval]) -> list[Interval]:
+    return [
+        (slot_start, slot_end)
+        for slot_start, slot_end in slots
+        if slot_start > now and not any(held_start < slot_end and slot_start < held_end for held_start, held_end in held)
+    ]
+
+
+def _iter_days(date_from: date, date_to: date):
+    day = date_from
+    while day <= date_to:
+        yield day
+        day += timedelta(days=1)
+
+
+async def _load_slot_context(db: AsyncSession, business_id: int, service_id: int) -> tuple[ZoneInfo, int] | None:
+    business = await reference_cache.get_business(db, business_id)
+    service = await reference_cache.get_service(db, business_id, service_id)
     if not business or not service:
-        return []
+        return None
+    return business.timezone, service.duration_minutes
+
+
+async def _load_active_staff_ids(db: AsyncSession, business_id: int) -> list[int]:
+    return list(
+        (
+            await db.scalars(
+                select(Staff.id).where(and_(Staff.business_id == business_id, Staff.is_active)).order_by(Staff.id)
+            )
+        ).all()
+    )
+
+
+def blocking_status_clause():
+    # Statuses are rendered as literals so the planner can match the partial
+    # blocking-status indexes even when asyncpg switches to a generic plan.
+    return Booking.status.in_(
+        bindparam("blocking_statuses", list(BLOCKING_BOOKING_STATUSES), expanding=True, literal_execute=True)
+    )
+
+
+def schedules_query(staff_ids: list[int], date_from: date, date_to: date) -> Select:
+    return (
+        select(Schedule)
+        .where(and_(Schedule.staff_id.in_(staff_ids), Schedule.day >= date_from, Schedule.day <= date_to))
+        .order_by(Schedule.staff_id, Schedule.day, Schedule.start_time)
+    )
+
+
+def blocked_ranges_query(staff_ids: list[int], window_start: datetime, window_end: datetime) -> Select:
+    return select(Booking.staff_id, Booking.start_at, Booking.end_at).where(
+        and_(
+            Booking.staff_id.in_(staff_ids),
+            Booking.end_at > window_start,
+            Booking.start_at < window_end,
+            blocking_status_clause(),
+        )
+    )
+
+
+async def _load_schedules(
+    db: AsyncSession,
+    staff_ids: list[int],
+    date_from: date,
+    date_to: date,
+) -> dict[tuple[int, date], list[Schedule]]:
+    schedules = (await db.scalars(schedules_query(staff_ids, date_from, date_to))).all()
+    grouped: dict[tuple[int, date], list[Schedule]] = defaultdict(list)
+    for schedule in schedules:
+        grouped[(schedule.staff_id, schedule.day)].append(schedule)
+    return grouped
 
-    tz = ZoneInfo(business.timezone)
 
-    schedules = (
-        await db.scalars(
-            select(Schedule).where(and_(Schedule.staff_id == staff_id, Schedule.day == day)).order_by(Schedule.start_time)
+async def load_day_schedules(
+    db: AsyncSession,
+    staff_ids: list[int],
+    date_from: date,
+    date_to: date,
+) -> dict[tuple[int, date], list[Schedule | TemplateEntry]]:
+    exceptions = await _load_schedules(db, staff_ids, date_from, date_to)
+    templates = await schedule_templates.load_weekly_templates(db, staff_ids)
+    return {
+        (staff_id, day): entries
+        for staff_id in staff_ids
+        for day in _iter_days(date_from, date_to)
+        if (
+            entries := schedule_templates.apply_exceptions(
+                schedule_templates.expand_day(templates[staff_id], day), exceptions.get((staff_id, day), [])
+            )
         )
-    ).all()
-    work_ranges: list[tuple[datetime, datetime]] = []
-    break_ranges: list[tuple[datetime, datetime]] = []
+    }
+
+
+async def _load_blocked_ranges(
+    db: AsyncSession,
+    staff_ids: list[int],
+    window_start: datetime,
+    window_end: datetime,
+    tz: ZoneInfo,
+) -> dict[tuple[int, date], list[Interval]]:
+    rows = (await db.execute(blocked_ranges_query(staff_ids, window_start, window_end))).all()
+    grouped: dict[tuple[int, date], list[Interval]] = defaultdict(list)
+    for row in rows:
+        start, end = row.start_at.astimezone(tz), row.end_at.astimezone(tz)
+        for day in _iter_days(start.date(), end.date()):
+            grouped[(row.staff_id, day)].append((start, end))
+    return grouped
+
+
+def _day_occupancy(
+    day: date,
+    schedules: list[Schedule | TemplateEntry],
+    booked_ranges: list[Interval],
+    tz: ZoneInfo,
+) -> occupancy.DayOccupancy:
+    work_ranges: list[Interval] = []
+    blocked_ranges = list(booked_ranges)
 
     for schedule in schedules:
         start = datetime.combine(day, schedule.start_time, tzinfo=tz)
@@ -47,43 +150,215 @@ async def find_free_slots(
         if schedule.schedule_type == ScheduleType.work:
             work_ranges.append((start, end))
         elif schedule.schedule_type == ScheduleType.break_time:
-            break_ranges.append((start, end))
+            blocked_ranges.append((start, end))
         elif schedule.schedule_type == ScheduleType.day_off:
-            return []
-
-    if not work_ranges:
-        return []
-
-    day_start = min(start for start, _ in work_ranges)
-    day_end = max(end for _, end in work_ranges)
-
-    bookings = (
-        await db.scalars(
-            select(Booking).where(
-                and_(
-                    Booking.staff_id == staff_id,
-                    Booking.start_at < day_end,
-                    Booking.end_at > day_start,
-                    Booking.status.in_(BLOCKING_BOOKING_STATUSES),
-                )
-            )
+            return occupancy.build(day, [], [], tz)
+
+    return occupancy.build(day, work_ranges, blocked_ranges, tz)
+
+
+async def _build_occupancy(
+    db: AsyncSession,
+    staff_ids: list[int],
+    date_from: date,
+    date_to: date,
+    tz: ZoneInfo,
+) -> dict[int, dict[date, occupancy.DayOccupancy]]:
+    schedules = await load_day_schedules(db, staff_ids, date_from, date_to)
+
+    window_start = datetime.combine(date_from, time.min, tzinfo=tz)
+    window_end = datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=tz)
+    booked = await _load_blocked_ranges(db, staff_ids, window_start, window_end, tz) if schedules else {}
+
+    return {
+        staff_id: {
+            day: _day_occupancy(day, schedules.get((staff_id, day), []), booked.get((staff_id, day), []), tz)
+            for day in _iter_days(date_from, date_to)
+        }
+        for staff_id in staff_ids
+    }
+
+
+async def _load_occupancy(
+    db: AsyncSession,
+    business_id: int,
+    staff_ids: list[int],
+    days: list[date],
+    tz: ZoneInfo,
+) -> dict[int, dict[date, occupancy.DayOccupancy]]:
+    generations, cached = await slot_cache.get_cached_occupancy(business_id, staff_ids, days)
+    stale = [staff_id for staff_id in staff_ids if len(cached[staff_id]) < len(days)]
+    if stale:
+        missing = sorted({day for staff_id in stale for day in days if day not in cached[staff_id]})
+        built = await _build_occupancy(db, stale, missing[0], missing[-1], tz)
+        await slot_cache.store_occupancy(
+            business_id,
+            generations,
+            {staff_id: {day: built[staff_id][day] for day in missing if day not in cached[staff_id]} for staff_id in stale},
         )
-    ).all()
+        for staff_id in stale:
+            cached[staff_id] = built[staff_id] | cached[staff_id]
+    return cached
+
+
+def _derive_slots(
+    occupancy_by_staff: dict[int, dict[date, occupancy.DayOccupancy]],
+    days: list[date],
+    tz: ZoneInfo,
+    duration_minutes: int,
+    step_minutes: int,
+) -> dict[int, dict[date, list[Interval]]]:
+    started = perf_counter()
+    slots = {
+        staff_id: {day: occupancy.free_slots(by_day[day], day, tz, duration_minutes, step_minutes) for day in days}
+        for staff_id, by_day in occupancy_by_staff.items()
+    }
+    SLOT_COMPUTE_SECONDS.observe(perf_counter() - started)
+    return slots
+
+
+async def find_free_slots_range(
+    db: AsyncSession,
+    business_id: int,
+    service_id: int,
+    staff_id: int,
+    date_from: date,
+    date_to: date,
+    step_minutes: int = 15,
+) -> dict[date, list[Interval]]:
+    days = list(_iter_days(date_from, date_to))
+    generation, slots_by_day = await slot_cache.get_cached_days(business_id, staff_id, service_id, step_minutes, days)
+
+    missing = [day for day in days if day not in slots_by_day]
+    if missing:
+        context = await _load_slot_context(db, business_id, service_id)
+        if not context:
+            return {day: [] for day in days}
+
+        tz, duration_minutes = context
+        occupancy_by_staff = await _load_occupancy(db, business_id, [staff_id], missing, tz)
+        computed = _derive_slots(occupancy_by_staff, missing, tz, duration_minutes, step_minutes)
+        await slot_cache.store_days(business_id, staff_id, service_id, step_minutes, generation, computed[staff_id])
+        slots_by_day.update(computed[staff_id])
+
+    held = (await slot_holds.held_ranges(business_id, [staff_id])).get(staff_id, [])
+    now = datetime.now(UTC)
+    result = {day: _available(slots_by_day[day], now, held) for day in days}
+    SLOTS_RETURNED.labels("staff").observe(sum(len(slots) for slots in result.values()))
+    return result
+
+
+async def find_free_slots(
+    db: AsyncSession,
+    business_id: int,
+    service_id: int,
+    staff_id: int,
+    day,
+    step_minutes: int = 15,
+) -> list[Interval]:
+    slots = await find_free_slots_range(db, business_id, service_id, staff_id, day, day, step_minutes)
+    return slots[day]
 
-    blocked_ranges = [(b.start_at.astimezone(tz), b.end_at.astimezone(tz)) for b in bookings]
-    blocked_ranges.extend(break_ranges)
 
-    service_duration = timedelta(minutes=service.duration_minutes)
-    step = timedelta(minutes=step_minutes)
-    slots: list[tuple[datetime, datetime]] = []
+async def find_free_slots_any_staff(
+    db: AsyncSession,
+    business_id: int,
+    service_id: int,
+    date_from: date,
+    date_to: date,
+    step_minutes: int = 15,
+) -> dict[date, list[tuple[datetime, datetime, list[int]]]]:
+    empty: dict[date, list[tuple[datetime, datetime, list[int]]]] = {day: [] for day in _iter_days(date_from, date_to)}
+    context = await _load_slot_context(db, business_id, service_id)
+    if not context:
+        return empty
+
+    staff_ids = await _load_active_staff_ids(db, business_id)
+    if not staff_ids:
+        return empty
+
+    tz, duration_minutes = context
+    days = list(_iter_days(date_from, date_to))
+    occupancy_by_staff = await _load_occupancy(db, business_id, staff_ids, days, tz)
+    slots = _derive_slots(occupancy_by_staff, days, tz, duration_minutes, step_minutes)
 
-    for work_start, work_end in work_ranges:
-        candidate_start = work_start
-        while candidate_start + service_duration <= work_end:
-            candidate_end = candidate_start + service_duration
-            if not any(_overlaps(candidate_start, candidate_end, blocked_start, blocked_end) for blocked_start, blocked_end in blocked_ranges):
-                slots.append((candidate_start, candidate_end))
-            candidate_start += step
+    held = await slot_holds.held_ranges(business_id, staff_ids)
+    now = datetime.now(UTC)
+    merged: dict[date, list[tuple[datetime, datetime, list[int]]]] = {}
+    for day in _iter_days(date_from, date_to):
+        candidates: dict[Interval, list[int]] = defaultdict(list)
+        for staff_id in staff_ids:
+            for slot in _available(slots[staff_id][day], now, held.get(staff_id, [])):
+                candidates[slot].append(staff_id)
+        merged[day] = [(start, end, candidates[(start, end)]) for start, end in sorted(candidates)]
+    SLOTS_RETURNED.labels("any_staff").observe(sum(len(slots) for slots in merged.values()))
+    return merged
 
-    now_tz = datetime.now(tz)
-    return [(slot_start, slot_end) for slot_start, slot_end in slots if slot_start > now_tz]
+
+async def find_slot_chains(
+    db: AsyncSession,
+    business_id: int,
+    steps: list[tuple[int, int | None]],
+    date_from: date,
+    date_to: date,
+    step_minutes: int = 15,
+) -> dict[date, list[list[ChainLink]]]:
+    days = list(_iter_days(date_from, date_to))
+    empty: dict[date, list[list[ChainLink]]] = {day: [] for day in days}
+    business = await reference_cache.get_business(db, business_id)
+    services = [await reference_cache.get_service(db, business_id, service_id) for service_id, _ in steps]
+    if not business or not all(service and service.is_active for service in services):
+        return empty
+
+    active_staff_ids = await _load_active_staff_ids(db, business_id)
+    candidates = [
+        active_staff_ids if staff_id is None else [staff_id] if staff_id in active_staff_ids else []
+        for _, staff_id in steps
+    ]
+    if not all(candidates):
+        return empty
+
+    tz = business.timezone
+    staff_ids = sorted({staff_id for staff_candidates in candidates for staff_id in staff_candidates})
+    occupancy_by_staff = await _load_occupancy(db, business_id, staff_ids, days + [date_to + timedelta(days=1)], tz)
+    held = await slot_holds.held_ranges(business_id, staff_ids)
+    now = datetime.now(UTC)
+
+    def free_staff(staff_candidates: list[int], start: datetime, duration_minutes: int) -> tuple[int, ...]:
+        day, minute = occupancy.local_minute(start, tz)
+        end = start + timedelta(minutes=duration_minutes)
+        return tuple(
+            staff_id
+            for staff_id in staff_candidates
+            if day in occupancy_by_staff[staff_id]
+            and occupancy.fits(occupancy_by_staff[staff_id][day], minute, duration_minutes)
+            and _available([(start, end)], now, held.get(staff_id, []))
+        )
+
+    started = perf_counter()
+    first_service, *next_services = services
+    chains = empty
+    for day in days:
+        openings: dict[Interval, list[int]] = defaultdict(list)
+        for staff_id in candidates[0]:
+            day_slots = occupancy.free_slots(
+                occupancy_by_staff[staff_id][day], day, tz, first_service.duration_minutes, step_minutes
+            )
+            for slot in _available(day_slots, now, held.get(staff_id, [])):
+                openings[slot].append(staff_id)
+
+        for start, end in sorted(openings):
+            chain = [ChainLink(first_service.id, start, end, tuple(openings[(start, end)]))]
+            for service, staff_candidates in zip(next_services, candidates[1:]):
+                link_staff = free_staff(staff_candidates, chain[-1].end_at, service.duration_minutes)
+                if not link_staff:
+                    break
+                link_start = chain[-1].end_at
+                chain.append(
+                    ChainLink(service.id, link_start, link_start + timedelta(minutes=service.duration_minutes), link_staff)
+                )
+            if len(chain) == len(services):
+                chains[day].append(chain)
+    SLOT_COMPUTE_SECONDS.observe(perf_counter() - started)
+    SLOTS_RETURNED.labels("chain").observe(sum(len(day_chains) for day_chains in chains.values()))
+    return chains
@@ -0,0 +1,164 @@
+import logging
+import secrets
+import time
+from datetime import UTC, datetime
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.db.redis import redis_client
+from app.services.intervals import Interval
+
+logger = logging.getLogger(__name__)
+
+_LUA_CLOCK = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+"""
+
+_LUA_FOREIGN_OVERLAP = """
+local function foreign_overlap(key, token, start_ms, end_ms)
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now)
+    for _, member in ipairs(redis.call('ZRANGE', key, 0, -1)) do
+        local held_token, held_start, held_end = string.match(member, '^(.-)|(%d+)|(%d+)$')
+        if held_token ~= token and tonumber(held_start) < end_ms and start_ms < tonumber(held_end) then
+            return true
+        end
+    end
+    return false
+end
+"""
+
+_ACQUIRE = redis_client.register_script(
+    _LUA_CLOCK
+    + _LUA_FOREIGN_OVERLAP
+    + """
+    if foreign_overlap(KEYS[1], ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3])) then
+        return 0
+    end
+    local expires_at = now + tonumber(ARGV[4])
+    redis.call('ZADD', KEYS[1], expires_at, ARGV[1] .. '|' .. ARGV[2] .. '|' .. ARGV[3])
+    local latest = redis.call('ZRANGE', KEYS[1], -1, -1, 'WITHSCORES')
+    redis.call('PEXPIREAT', KEYS[1], latest[2])
+    return expires_at
+    """
+)
+
+_CHECK = redis_client.register_script(
+    _LUA_CLOCK
+    + _LUA_FOREIGN_OVERLAP
+    + """
+    for i, key in ipairs(KEYS) do
+        if foreign_overlap(key, ARGV[i * 3 - 2], tonumber(ARGV[i * 3 - 1]), tonumber(ARGV[i * 3])) then
+            return 0
+        end
+    end
+    return 1
+    """
+)
+
+_RELEASE = redis_client.register_script(
+    """
+    local released = {}
+    for i, key in ipairs(KEYS) do
+        local prefix = ARGV[i] .. '|'
+        local members = {}
+        for _, member in ipairs(redis.call('ZRANGE', key, 0, -1)) do
+            if string.sub(member, 1, #prefix) == prefix then
+                table.insert(members, member)
+            end
+        end
+        if #members > 0 then
+            redis.call('ZREM', key, unpack(members))
+        end
+        released[i] = members
+    end
+    return released
+    """
+)
+
+
+class SlotUnavailableError(Exception):
+    pass
+
+
+def _holds_key(business_id: int, staff_id: int) -> str:
+    return f"holds:{{{business_id}:{staff_id}}}"
+
+
+def _to_ms(value: datetime) -> int:
+    return int(value.timestamp() * 1000)
+
+
+def _from_ms(value: str | float) -> datetime:
+    return datetime.fromtimestamp(int(value) / 1000, tz=UTC)
+
+
+async def acquire(business_id: int, staff_id: int, start_at: datetime, end_at: datetime) -> tuple[str, datetime]:
+    token = secrets.token_urlsafe(16)
+    expires_at = await _ACQUIRE(
+        keys=[_holds_key(business_id, staff_id)],
+        args=[token, _to_ms(start_at), _to_ms(end_at), settings.slot_hold_ttl_seconds * 1000],
+    )
+    if not expires_at:
+        raise SlotUnavailableError
+    return token, _from_ms(expires_at)
+
+
+async def check_all(business_id: int, holds: list[tuple[int, datetime, datetime, str | None]]) -> bool:
+    keys, args = [], []
+    for staff_id, start_at, end_at, token in holds:
+        keys.append(_holds_key(business_id, staff_id))
+        args.extend([token or "", _to_ms(start_at), _to_ms(end_at)])
+    try:
+        return bool(await _CHECK(keys=keys, args=args))
+    except RedisError as exc:
+        logger.warning("Slot hold check failed: %s", exc)
+        return True
+
+
+async def check(business_id: int, staff_id: int, start_at: datetime, end_at: datetime, token: str | None) -> bool:
+    return await check_all(business_id, [(staff_id, start_at, end_at, token)])
+
+
+async def release(business_id: int, staff_id: int, token: str) -> list[Interval]:
+    (released,) = await _RELEASE(keys=[_holds_key(business_id, staff_id)], args=[token])
+    members = (member.split("|") for member in released)
+    return [(_from_ms(start_ms), _from_ms(end_ms)) for _, start_ms, end_ms in members]
+
+
+async def consume_all(business_id: int, holds: list[tuple[int, str | None]]) -> None:
+    holds = [(staff_id, token) for staff_id, token in holds if token]
+    if not holds:
+        return
+    try:
+        await _RELEASE(
+            keys=[_holds_key(business_id, staff_id) for staff_id, _ in holds], args=[token for _, token in holds]
+        )
+    except RedisError as exc:
+        logger.warning("Slot hold consume failed: %s", exc)
+
+
+async def consume(business_id: int, staff_id: int, token: str | None) -> None:
+    await consume_all(business_id, [(staff_id, token)])
+
+
+async def held_ranges(business_id: int, staff_ids: list[int]) -> dict[int, list[Interval]]:
+    now_ms = int(time.time() * 1000)
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for staff_id in staff_ids:
+                pipe.zrangebyscore(_holds_key(business_id, staff_id), now_ms, "+inf")
+            members_by_staff = await pipe.execute()
+    except RedisError as exc:
+        logger.warning("Slot hold read failed: %s", exc)
+        return {}
+
+    held: dict[int, list[Interval]] = {}
+    for staff_id, members in zip(staff_ids, members_by_staff):
+        if members:
+            held[staff_id] = [
+                (_from_ms(start_ms), _from_ms(end_ms))
+                for _, start_ms, end_ms in (member.split("|") for member in members)
+            ]
+    return held
@@ -0,0 +1,69 @@
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import date
+
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.schemas.booking import DaySlotsOut, SlotDeltaOut, SlotOut, SlotRangeQuery
+from app.services.availability_events import hub
+from app.services.intervals import Interval
+from app.services.slot_finder import find_free_slots_range
+
+_snapshot_adapter = TypeAdapter(list[DaySlotsOut])
+
+
+def _slots_out(slots: list[Interval]) -> list[SlotOut]:
+    return [SlotOut(start_at=start, end_at=end) for start, end in slots]
+
+
+def _event(name: str, data: str) -> str:
+    return f"event: {name}\ndata: {data}\n\n"
+
+
+async def _load(query: SlotRangeQuery, date_from: date, date_to: date) -> dict[date, list[Interval]]:
+    async with AsyncSessionLocal() as db:
+        return await find_free_slots_range(
+            db=db,
+            business_id=query.business_id,
+            service_id=query.service_id,
+            staff_id=query.staff_id,
+            date_from=date_from,
+            date_to=date_to,
+            step_minutes=query.step_minutes,
+        )
+
+
+async def stream_slot_updates(query: SlotRangeQuery) -> AsyncIterator[str]:
+    subscription = await hub.subscribe(query.business_id, query.staff_id)
+    try:
+        current = await _load(query, query.date_from, query.date_to)
+        snapshot = [DaySlotsOut(day=day, slots=_slots_out(slots)) for day, slots in current.items()]
+        yield _event("snapshot", _snapshot_adapter.dump_json(snapshot).decode())
+
+        while True:
+            try:
+                await asyncio.wait_for(subscription.changed.wait(), timeout=settings.availability_stream_heartbeat_seconds)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            changed = subscription.take_changes()
+            days = [day for day in current if changed is None or day in changed]
+            if not days:
+                continue
+
+            fresh = await _load(query, days[0], days[-1])
+            for day in days:
+                previous, updated = set(current[day]), set(fresh[day])
+                current[day] = fresh[day]
+                if previous != updated:
+                    delta = SlotDeltaOut(
+                        day=day,
+                        added=_slots_out(sorted(updated - previous)),
+                        removed=_slots_out(sorted(previous - updated)),
+                    )
+                    yield _event("delta", delta.model_dump_json())
+    finally:
+        hub.unsubscribe(subscription)
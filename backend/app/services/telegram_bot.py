@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+from enum import StrEnum
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RETRY_BACKOFF_SECONDS = 1.0
+
+
+class DeliveryResult(StrEnum):
+    delivered = "delivered"
+    rejected = "rejected"
+    failed = "failed"
+
+
+class RateLimiter:
+    def __init__(self, rate_per_second: float, chat_rate_per_second: float) -> None:
+        self.rate = rate_per_second
+        self.chat_interval = 1 / chat_rate_per_second
+        self._tokens = 1.0
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._chat_ready_at: dict[int, float] = {}
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(1.0, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        if len(self._chat_ready_at) > 10000:
+            self._chat_ready_at = {chat_id: ready for chat_id, ready in self._chat_ready_at.items() if ready > now}
+
+    async def acquire(self, chat_id: int) -> None:
+        while True:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(
+                self._paused_until - now,
+                self._chat_ready_at.get(chat_id, 0.0) - now,
+                (1 - self._tokens) / self.rate,
+            )
+            if wait <= 0:
+                self._tokens -= 1
+                self._chat_ready_at[chat_id] = now + self.chat_interval
+                return
+            await asyncio.sleep(wait)
+
+
+class TelegramBot:
+    def __init__(
+        self,
+        token: str = settings.telegram_bot_token,
+        base_url: str = settings.telegram_api_base_url,
+        limiter: RateLimiter | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.limiter = limiter or RateLimiter(
+            settings.telegram_global_rate_per_second, settings.telegram_chat_rate_per_second
+        )
+        self._client = httpx.AsyncClient(
+            base_url=f"{base_url.rstrip('/')}/bot{token}/",
+            timeout=settings.telegram_api_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=settings.telegram_max_connections,
+                max_keepalive_connections=settings.telegram_max_connections,
+            ),
+            transport=transport,
+        )
+
+    async def send_message(self, chat_id: int, text: str) -> DeliveryResult:
+        for attempt in range(1, settings.telegram_send_max_attempts + 1):
+            await self.limiter.acquire(chat_id)
+            try:
+                response = await self._client.post("sendMessage", json={"chat_id": chat_id, "text": text})
+            except httpx.HTTPError as exc:
+                logger.warning("Telegram sendMessage to %s failed: %s", chat_id, exc)
+                await asyncio.sleep(RETRY_BACKOFF_SECONDS * attempt)
+                continue
+
+            if response.status_code == 200:
+                return DeliveryResult.delivered
+            if response.status_code == 429:
+                retry_after = _retry_after(response)
+                logger.info("Telegram rate limit hit, retrying after %ss", retry_after)
+                self.limiter.pause(retry_after)
+                continue
+            if response.status_code < 500:
+                logger.warning("Telegram rejected message to %s: %s", chat_id, response.text)
+                return DeliveryResult.rejected
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS * attempt)
+        return DeliveryResult.failed
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def _retry_after(response: httpx.Response) -> float:
+    try:
+        return float(response.json()["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        return RETRY_BACKOFF_SECONDS
@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+import logging
+from datetime import date
+
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.db.redis import redis_client
+from app.db.session import AsyncSessionLocal, engine
+from app.services.analytics import backfill, drain_dirty
+
+logger = logging.getLogger(__name__)
+
+
+async def drain() -> int:
+    refreshed = 0
+    while processed := await drain_dirty(settings.analytics_dirty_batch_size):
+        refreshed += processed
+    return refreshed
+
+
+async def run(once: bool) -> None:
+    try:
+        while True:
+            try:
+                refreshed = await drain()
+                if refreshed:
+                    logger.info("Refreshed %s staff day aggregates", refreshed)
+            except (RedisError, SQLAlchemyError) as exc:
+                logger.warning("Analytics refresh failed, retrying: %s", exc)
+            if once:
+                return
+            await asyncio.sleep(settings.analytics_refresh_interval_seconds)
+    finally:
+        await redis_client.aclose()
+        await engine.dispose()
+
+
+async def run_backfill(business_id: int, date_from: date, date_to: date) -> None:
+    try:
+        async with AsyncSessionLocal() as db:
+            refreshed = await backfill(db, business_id, date_from, date_to)
+        logger.info("Backfilled %s staff day aggregates for business %s", refreshed, business_id)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh staff daily analytics aggregates")
+    parser.add_argument("--once", action="store_true", help="drain pending changes and exit")
+    parser.add_argument("--business-id", type=int, help="backfill aggregates for this business")
+    parser.add_argument("--date-from", type=date.fromisoformat)
+    parser.add_argument("--date-to", type=date.fromisoformat)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    if args.business_id is not None:
+        if args.date_from is None or args.date_to is None or args.date_from > args.date_to:
+            parser.error("--business-id requires --date-from <= --date-to")
+        asyncio.run(run_backfill(args.business_id, args.date_from, args.date_to))
+    else:
+        asyncio.run(run(args.once))
+
+
+if __name__ == "__main__":
+    main()
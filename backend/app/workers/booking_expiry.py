@@ -0,0 +1,44 @@
+import argparse
+import asyncio
+import logging
+
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.db.redis import redis_client
+from app.db.session import AsyncSessionLocal, engine
+from app.services.booking_expiry import expire_pending_bookings
+
+logger = logging.getLogger(__name__)
+
+
+async def run(once: bool) -> None:
+    try:
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    expired = await expire_pending_bookings(db)
+                if expired:
+                    logger.info("Expired %s unpaid pending bookings", expired)
+            except (RedisError, SQLAlchemyError) as exc:
+                logger.warning("Pending booking sweep failed, retrying: %s", exc)
+            if once:
+                return
+            await asyncio.sleep(settings.pending_booking_sweep_interval_seconds)
+    finally:
+        await redis_client.aclose()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Expire pending bookings left unpaid past the payment window")
+    parser.add_argument("--once", action="store_true", help="run a single sweep and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    asyncio.run(run(args.once))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.db.session import engine
+from app.services.notifications import NotificationKind, dispatch_batch
+from app.services.telegram_bot import DeliveryResult, TelegramBot
+
+logger = logging.getLogger(__name__)
+
+
+async def drain(bot: TelegramBot) -> None:
+    for kind in NotificationKind:
+        while True:
+            counts = await dispatch_batch(bot, kind)
+            claimed = sum(counts.values())
+            if claimed:
+                logger.info("Dispatched %s %s notifications: %s", claimed, kind.value, counts)
+            if claimed < settings.notification_batch_size or counts[DeliveryResult.failed.value]:
+                break
+
+
+async def run(once: bool) -> None:
+    bot = TelegramBot()
+    try:
+        while True:
+            try:
+                await drain(bot)
+            except SQLAlchemyError as exc:
+                logger.warning("Notification dispatch failed, retrying: %s", exc)
+            if once:
+                return
+            await asyncio.sleep(settings.notification_poll_interval_seconds)
+    finally:
+        await bot.aclose()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Send Telegram booking confirmations and reminders")
+    parser.add_argument("--once", action="store_true", help="send everything currently due and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    if not settings.telegram_bot_token:
+        parser.error("TELEGRAM_BOT_TOKEN is not configured")
+    asyncio.run(run(args.once))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import logging
+import socket
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError, SQLAlchemyError
+
+from app.core.config import settings
+from app.db.redis import create_redis_client
+from app.db.session import AsyncSessionLocal, engine
+from app.services.payments import (
+    EventOutcome,
+    InvalidPaymentEvent,
+    PaymentEvent,
+    apply_yookassa_events,
+    parse_yookassa_event,
+)
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY_SECONDS = 1.0
+
+
+async def ensure_group(client: Redis) -> None:
+    try:
+        await client.xgroup_create(
+            settings.yookassa_webhook_stream, settings.webhook_worker_group, id="0", mkstream=True
+        )
+    except ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+async def read_batch(client: Redis, consumer: str) -> list[tuple[str, dict]]:
+    _, messages, _ = await client.xautoclaim(
+        settings.yookassa_webhook_stream,
+        settings.webhook_worker_group,
+        consumer,
+        min_idle_time=settings.webhook_worker_claim_idle_ms,
+        start_id="0-0",
+        count=settings.webhook_worker_batch_size,
+    )
+    if messages:
+        return messages
+
+    response = await client.xreadgroup(
+        settings.webhook_worker_group,
+        consumer,
+        {settings.yookassa_webhook_stream: ">"},
+        count=settings.webhook_worker_batch_size,
+        block=settings.webhook_worker_block_ms,
+    )
+    return response[0][1] if response else []
+
+
+def _is_transient(exc: Exception) -> bool:
+    if isinstance(exc, DBAPIError) and exc.connection_invalidated:
+        return True
+    return isinstance(exc, (OperationalError, InterfaceError, RedisError, OSError, TimeoutError))
+
+
+async def delivery_counts(client: Redis, message_ids: list[str]) -> dict[str, int]:
+    async with client.pipeline(transaction=False) as pipe:
+        for message_id in message_ids:
+            pipe.xpending_range(
+                settings.yookassa_webhook_stream, settings.webhook_worker_group, min=message_id, max=message_id, count=1
+            )
+        pending = await pipe.execute()
+    return {
+        message_id: entries[0]["times_delivered"] if entries else 1 for message_id, entries in zip(message_ids, pending)
+    }
+
+
+async def dead_letter(client: Redis, message_id: str, fields: dict, reason: str) -> None:
+    logger.error("Dead-lettering webhook message %s: %s", message_id, reason)
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.xadd(settings.yookassa_webhook_dead_letter_stream, {**fields, "message_id": message_id, "reason": reason})
+        pipe.xack(settings.yookassa_webhook_stream, settings.webhook_worker_group, message_id)
+        pipe.xdel(settings.yookassa_webhook_stream, message_id)
+        await pipe.execute()
+
+
+async def _apply(events: list[PaymentEvent]) -> list[EventOutcome]:
+    async with AsyncSessionLocal() as db:
+        return await apply_yookassa_events(db, events)
+
+
+async def process_batch(client: Redis, messages: list[tuple[str, dict]]) -> dict[str, int]:
+    counts = {outcome.value: 0 for outcome in EventOutcome} | {"failed": 0, "dead_lettered": 0}
+    deliveries = await delivery_counts(client, [message_id for message_id, _ in messages])
+    message_ids, events = [], []
+    for message_id, fields in messages:
+        if deliveries[message_id] > settings.webhook_worker_max_deliveries:
+            await dead_letter(client, message_id, fields, f"delivered {deliveries[message_id]} times")
+            counts["dead_lettered"] += 1
+            continue
+        try:
+            events.append(parse_yookassa_event(json.loads(fields["event"])))
+            message_ids.append(message_id)
+        except (KeyError, json.JSONDecodeError, InvalidPaymentEvent) as exc:
+            await dead_letter(client, message_id, fields, f"malformed: {exc!r}")
+            counts["dead_lettered"] += 1
+    if not events:
+        return counts
+
+    try:
+        results = list(zip(message_ids, events, await _apply(events)))
+    except Exception as exc:
+        if _is_transient(exc):
+            raise
+        logger.warning("Webhook batch of %s failed, retrying one at a time: %r", len(events), exc)
+        results = []
+        for message_id, event in zip(message_ids, events):
+            try:
+                (outcome,) = await _apply([event])
+            except Exception as exc:
+                if _is_transient(exc):
+                    raise
+                logger.error("Webhook message %s failed on delivery %s: %r", message_id, deliveries[message_id], exc)
+                counts["failed"] += 1
+                continue
+            results.append((message_id, event, outcome))
+
+    for message_id, event, outcome in results:
+        counts[outcome.value] += 1
+        if outcome == EventOutcome.booking_not_found:
+            logger.warning("Webhook %s references unknown booking %s", message_id, event.booking_id)
+    if results:
+        await acknowledge(client, [message_id for message_id, _, _ in results])
+    return counts
+
+
+async def acknowledge(client: Redis, message_ids: list[str]) -> None:
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.xack(settings.yookassa_webhook_stream, settings.webhook_worker_group, *message_ids)
+        pipe.xdel(settings.yookassa_webhook_stream, *message_ids)
+        await pipe.execute()
+
+
+async def run(consumer: str) -> None:
+    client = create_redis_client(socket_timeout=settings.webhook_worker_block_ms / 1000 + settings.redis_socket_timeout_seconds)
+    await ensure_group(client)
+    logger.info("Webhook worker %s consuming %s", consumer, settings.yookassa_webhook_stream)
+    try:
+        while True:
+            try:
+                messages = await read_batch(client, consumer)
+                if messages:
+                    counts = await process_batch(client, messages)
+                    logger.info("Processed %s webhook messages: %s", len(messages), counts)
+            except (RedisError, SQLAlchemyError) as exc:
+                logger.warning("Webhook batch failed, retrying: %s", exc)
+                await asyncio.sleep(RETRY_DELAY_SECONDS)
+            except Exception:
+                logger.exception("Webhook batch crashed, retrying")
+                await asyncio.sleep(RETRY_DELAY_SECONDS)
+    finally:
+        await client.aclose()
+        await engine.dispose()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    asyncio.run(run(socket.gethostname()))
+
+
+if __name__ == "__main__":
+    main()
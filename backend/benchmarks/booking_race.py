@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import collections
+from datetime import UTC, datetime, time, timedelta
+from decimal import Decimal
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete, text
+
+from app.db.session import AsyncSessionLocal, engine
+from app.main import app
+from app.models import Booking, Business, Service, Staff
+
+OVERLAP_SQL = text(
+    """
+    SELECT count(*)
+    FROM bookings a
+    JOIN bookings b ON a.staff_id = b.staff_id AND a.id < b.id
+    WHERE a.staff_id = ANY(:staff_ids)
+      AND a.status IN ('pending', 'confirmed', 'paid', 'completed')
+      AND b.status IN ('pending', 'confirmed', 'paid', 'completed')
+      AND a.start_at < b.end_at
+      AND b.start_at < a.end_at
+    """
+)
+
+
+async def seed(staff_count: int) -> tuple[int, int, list[int]]:
+    async with AsyncSessionLocal() as db:
+        business = Business(name="race-bench", timezone="UTC", currency="RUB")
+        db.add(business)
+        await db.flush()
+        service = Service(business_id=business.id, name="race", price=Decimal("1000"), duration_minutes=60)
+        staff = [Staff(business_id=business.id, full_name=f"race-{i}") for i in range(staff_count)]
+        db.add(service)
+        db.add_all(staff)
+        await db.commit()
+        return business.id, service.id, [member.id for member in staff]
+
+
+async def cleanup(business_id: int) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Booking).where(Booking.business_id == business_id))
+        await db.execute(delete(Business).where(Business.id == business_id))
+        await db.commit()
+
+
+async def run(concurrency: int, staff_count: int) -> int:
+    business_id, service_id, staff_ids = await seed(staff_count)
+    base = datetime.combine(datetime.now(UTC).date() + timedelta(days=30), time(10), tzinfo=UTC)
+    offsets = [timedelta(minutes=minutes) for minutes in (0, 15, 30, 45, 60)]
+
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            requests = [
+                client.post(
+                    "/api/v1/booking",
+                    json={
+                        "business_id": business_id,
+                        "service_id": service_id,
+                        "staff_id": staff_ids[i % staff_count],
+                        "start_at": (base + offsets[i % len(offsets)]).isoformat(),
+                    },
+                )
+                for i in range(concurrency)
+            ]
+            responses = await asyncio.gather(*requests)
+
+        async with engine.connect() as conn:
+            overlaps = await conn.scalar(OVERLAP_SQL, {"staff_ids": staff_ids})
+    finally:
+        await cleanup(business_id)
+        await engine.dispose()
+
+    statuses = collections.Counter(response.status_code for response in responses)
+    print(f"requests={concurrency} staff={staff_count} statuses={dict(sorted(statuses.items()))} overlaps={overlaps}")
+    return overlaps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fire concurrent bookings at the same slots and count overlaps")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--staff", type=int, default=2)
+    args = parser.parse_args()
+
+    overlaps = asyncio.run(run(args.concurrency, args.staff))
+    if overlaps:
+        raise SystemExit(f"found {overlaps} overlapping bookings")
+
+
+if __name__ == "__main__":
+    main()
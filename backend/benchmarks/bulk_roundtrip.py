@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import date, time, timedelta
+
+from sqlalchemy import delete, select
+
+from app.db.session import AsyncSessionLocal, engine
+from app.models import Business, Schedule, ScheduleType, Staff
+from app.schemas.bulk import BulkKind
+from app.services.bulk_io import import_rows
+
+SHIFTS = (
+    (ScheduleType.work, time(9), time(18)),
+    (ScheduleType.break_time, time(13), time(14)),
+    (ScheduleType.day_off, time(0), time(23, 59)),
+)
+
+
+async def seed() -> tuple[int, int, int]:
+    async with AsyncSessionLocal() as db:
+        business = Business(name="bulk-roundtrip", timezone="UTC", currency="RUB")
+        db.add(business)
+        await db.flush()
+        kept = Staff(business_id=business.id, full_name="kept")
+        dropped = Staff(business_id=business.id, full_name="dropped")
+        db.add_all([kept, dropped])
+        await db.commit()
+        return business.id, kept.id, dropped.id
+
+
+async def cleanup(business_id: int) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Business).where(Business.id == business_id))
+        await db.commit()
+
+
+def _expected(staff_id: int, days: int, offset: int) -> list[tuple]:
+    first_day = date.today() + timedelta(days=60 + offset)
+    return [
+        (staff_id, schedule_type, first_day + timedelta(days=day), start_time, end_time)
+        for day in range(days)
+        for schedule_type, start_time, end_time in SHIFTS
+    ]
+
+
+async def _records(rows: list[tuple], before=None) -> AsyncIterator[tuple[int, dict]]:
+    if before is not None:
+        await before()
+    for line_number, (staff_id, schedule_type, day, start_time, end_time) in enumerate(rows, start=2):
+        yield line_number, {
+            "staff_id": staff_id,
+            "schedule_type": schedule_type.value,
+            "day": day.isoformat(),
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+        }
+
+
+async def _import(business_id: int, rows: list[tuple], before=None):
+    async with AsyncSessionLocal() as db:
+        return await import_rows(db, business_id, BulkKind.schedules, _records(rows, before))
+
+
+async def run(days: int) -> list[str]:
+    business_id, kept_id, dropped_id = await seed()
+    try:
+        copied = _expected(kept_id, days, 0)
+        copy_report = await _import(business_id, copied)
+
+        async def drop_staff() -> None:
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(Staff).where(Staff.id == dropped_id))
+                await db.commit()
+
+        # Rows for staff deleted after validation fail the COPY, forcing the per-row fallback for the chunk.
+        fallback = _expected(kept_id, days, days)
+        fallback_report = await _import(business_id, fallback + _expected(dropped_id, 1, 0), drop_staff)
+
+        async with AsyncSessionLocal() as db:
+            schedules = (await db.scalars(select(Schedule).where(Schedule.staff_id == kept_id))).all()
+    finally:
+        await cleanup(business_id)
+        await engine.dispose()
+
+    loaded = sorted((row.staff_id, row.schedule_type, row.day, row.start_time, row.end_time) for row in schedules)
+    print(
+        f"copy imported={copy_report.imported} failed={copy_report.failed}; "
+        f"fallback imported={fallback_report.imported} failed={fallback_report.failed}; loaded={len(loaded)}"
+    )
+    problems = []
+    if copy_report.failed:
+        problems.append(f"COPY path rejected rows: {copy_report.errors[:3]}")
+    if fallback_report.imported != len(fallback) or fallback_report.failed != len(SHIFTS):
+        problems.append(f"fallback path imported {fallback_report.imported} rows: {fallback_report.errors[:3]}")
+    if loaded != sorted(copied + fallback):
+        problems.append("schedules read back through the ORM differ from the imported rows")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import schedules through COPY and the row fallback and read them back")
+    parser.add_argument("--days", type=int, default=7)
+    args = parser.parse_args()
+
+    problems = asyncio.run(run(args.days))
+    if problems:
+        raise SystemExit("; ".join(problems))
+
+
+if __name__ == "__main__":
+    main()
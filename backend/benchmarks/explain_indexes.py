@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+import json
+from datetime import UTC, datetime, time, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.db.session import engine
+from app.services.slot_finder import blocked_ranges_query, schedules_query
+
+EXPECTED_INDEXES = {
+    "bookings": {"ix_bookings_staff_id_end_at_blocking"},
+    "schedules": {"ix_schedules_staff_id_day"},
+}
+INDEX_SCAN_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+async def seed(conn: AsyncConnection, staff_count: int, bookings_per_staff: int, schedule_days: int) -> tuple[int, list[int], datetime]:
+    business_id = await conn.scalar(
+        text("INSERT INTO businesses (name, timezone, currency) VALUES ('explain-bench', 'UTC', 'RUB') RETURNING id")
+    )
+    service_id = await conn.scalar(
+        text(
+            "INSERT INTO services (business_id, name, price, duration_minutes, is_active) "
+            "VALUES (:business_id, 'explain', 1000, 60, true) RETURNING id"
+        ),
+        {"business_id": business_id},
+    )
+    staff_ids = list(
+        (
+            await conn.scalars(
+                text(
+                    "INSERT INTO staff (business_id, full_name, role, is_active) "
+                    "SELECT CAST(:business_id AS integer), 'explain-' || n, 'master', true FROM generate_series(1, :staff_count) AS n "
+                    "RETURNING id"
+                ),
+                {"business_id": business_id, "staff_count": staff_count},
+            )
+        ).all()
+    )
+
+    today = datetime.now(UTC).date()
+    history_start = datetime.combine(today + timedelta(days=30), time(), tzinfo=UTC) - timedelta(hours=2 * bookings_per_staff)
+    await conn.execute(
+        text(
+            """
+            INSERT INTO bookings (business_id, service_id, staff_id, start_at, end_at, status, source, total_price)
+            SELECT s.business_id, CAST(:service_id AS integer), s.id,
+                   CAST(:history_start AS timestamptz) + n * interval '2 hours',
+                   CAST(:history_start AS timestamptz) + n * interval '2 hours' + interval '90 minutes',
+                   (ARRAY['pending', 'confirmed', 'paid', 'completed', 'no_show'])[1 + n % 5]::bookingstatus,
+                   'telegram'::bookingsource, 1000
+            FROM staff s, generate_series(0, :bookings_per_staff - 1) AS n
+            WHERE s.business_id = :business_id
+            """
+        ),
+        {
+            "business_id": business_id,
+            "service_id": service_id,
+            "history_start": history_start,
+            "bookings_per_staff": bookings_per_staff,
+        },
+    )
+    await conn.execute(
+        text(
+            """
+            INSERT INTO schedules (staff_id, schedule_type, day, start_time, end_time)
+            SELECT s.id, 'work'::scheduletype, CAST(:first_day AS date) + n, time '09:00', time '21:00'
+            FROM staff s, generate_series(0, :schedule_days - 1) AS n
+            WHERE s.business_id = :business_id
+            """
+        ),
+        {"business_id": business_id, "first_day": today - timedelta(days=schedule_days - 60), "schedule_days": schedule_days},
+    )
+    return business_id, staff_ids, datetime.combine(today, time(), tzinfo=UTC)
+
+
+async def explain(conn: AsyncConnection, statement) -> dict:
+    compiled = statement.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)
+    plan = result.scalar_one()
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+
+
+def iter_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_nodes(child)
+
+
+def check_plan(name: str, table: str, plan: dict) -> list[str]:
+    errors = []
+    accesses = [
+        (node["Node Type"], node.get("Index Name"))
+        for node in iter_nodes(plan)
+        if node.get("Relation Name") == table or node.get("Index Name") in EXPECTED_INDEXES[table]
+    ]
+    print(f"{name}: {accesses}")
+    if any(node_type == "Seq Scan" for node_type, _ in accesses):
+        errors.append(f"{name}: sequential scan on {table}")
+    if not any(node_type in INDEX_SCAN_NODES and index in EXPECTED_INDEXES[table] for node_type, index in accesses):
+        errors.append(f"{name}: expected one of {sorted(EXPECTED_INDEXES[table])}")
+    return errors
+
+
+async def run(args: argparse.Namespace) -> list[str]:
+    async with engine.connect() as raw_conn:
+        conn = await raw_conn.execution_options(isolation_level="AUTOCOMMIT")
+        business_id, staff_ids, today = await seed(conn, args.staff, args.bookings_per_staff, args.schedule_days)
+        try:
+            await conn.exec_driver_sql("VACUUM ANALYZE bookings")
+            await conn.exec_driver_sql("VACUUM ANALYZE schedules")
+
+            probe_staff = staff_ids[: args.probe_staff]
+            window_start = today + timedelta(days=1)
+            window_end = window_start + timedelta(days=args.window_days)
+
+            errors = check_plan(
+                "blocked_ranges_query",
+                "bookings",
+                await explain(conn, blocked_ranges_query(probe_staff, window_start, window_end)),
+            )
+            errors += check_plan(
+                "schedules_query",
+                "schedules",
+                await explain(conn, schedules_query(probe_staff, window_start.date(), window_end.date())),
+            )
+        finally:
+            if not args.keep:
+                await conn.execute(text("DELETE FROM bookings WHERE business_id = :id"), {"id": business_id})
+                await conn.execute(text("DELETE FROM businesses WHERE id = :id"), {"id": business_id})
+    await engine.dispose()
+    return errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed a large dataset and check slot queries use the tuned indexes")
+    parser.add_argument("--staff", type=int, default=250)
+    parser.add_argument("--bookings-per-staff", type=int, default=8000)
+    parser.add_argument("--schedule-days", type=int, default=730)
+    parser.add_argument("--probe-staff", type=int, default=1)
+    parser.add_argument("--window-days", type=int, default=28)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded rows for manual inspection")
+    args = parser.parse_args()
+
+    errors = asyncio.run(run(args))
+    if errors:
+        raise SystemExit("\n".join(errors))
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import time
+from datetime import UTC, datetime, timedelta
+
+from app.core.tokens import HmacBackend, JoseBackend, TokenBackend, TokenVerifier
+
+
+def build_tokens(backend: TokenBackend, count: int) -> list[str]:
+    expire = datetime.now(UTC) + timedelta(hours=1)
+    return [backend.encode({"sub": f"user-{index}", "exp": expire}) for index in range(count)]
+
+
+def _measure(verify, tokens: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for token in tokens:
+            verify(token)
+        best = min(best, time.perf_counter() - started)
+    return len(tokens) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare JWT verification throughput across backends and the cache")
+    parser.add_argument("--tokens", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--secret", default="bench-secret")
+    parser.add_argument("--algorithm", default="HS256")
+    args = parser.parse_args()
+
+    jose_backend = JoseBackend(args.secret, args.algorithm)
+    hmac_backend = HmacBackend(args.secret, args.algorithm)
+    tokens = build_tokens(jose_backend, args.tokens)
+    if [hmac_backend.decode(token) for token in tokens] != [jose_backend.decode(token) for token in tokens]:
+        raise SystemExit("hmac backend decodes tokens differently from jose")
+
+    results = {
+        "jose": _measure(jose_backend.decode, tokens, args.repeat),
+        "hmac": _measure(hmac_backend.decode, tokens, args.repeat),
+    }
+    for name, backend in (("jose+cache", jose_backend), ("hmac+cache", hmac_backend)):
+        verifier = TokenVerifier(backend, cache_maxsize=args.tokens)
+        for token in tokens:
+            verifier.verify(token)
+        results[name] = _measure(verifier.verify, tokens, args.repeat)
+
+    print(f"tokens={args.tokens} algorithm={args.algorithm}")
+    for name, rate in results.items():
+        print(f"{name:<11} {rate:12,.0f} tokens/s  ({rate / results['jose']:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
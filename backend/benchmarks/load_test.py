@@ -0,0 +1,335 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from datetime import UTC, date, datetime, timedelta
+from datetime import time as dtime
+from decimal import Decimal
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient, Response
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.main import app
+from app.models import Base, Booking, BookingSource, BookingStatus, Business, Schedule, ScheduleType, Service, Staff
+
+SEED_STATUSES = (
+    BookingStatus.completed,
+    BookingStatus.completed,
+    BookingStatus.paid,
+    BookingStatus.confirmed,
+    BookingStatus.pending,
+    BookingStatus.no_show,
+)
+
+
+class QueryCounter:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+
+def _schedule_row(staff_id: int, schedule_type: ScheduleType, day: date, start: dtime, end: dtime) -> dict:
+    return {"staff_id": staff_id, "schedule_type": schedule_type, "day": day, "start_time": start, "end_time": end}
+
+
+async def seed(db: AsyncSession, args: argparse.Namespace, rng: random.Random) -> dict:
+    today = datetime.now(UTC).date()
+    first_day = today - timedelta(days=args.history_days)
+    total_days = args.history_days + args.days
+    dataset: dict = {"businesses": []}
+
+    for business_index in range(args.businesses):
+        business = Business(name=f"bench-{business_index}", timezone="Europe/Moscow", currency="RUB")
+        db.add(business)
+        await db.flush()
+        services = [
+            Service(business_id=business.id, name=f"service-{i}", price=Decimal(1500 + 250 * i), duration_minutes=duration)
+            for i, duration in enumerate((30, 45, 60, 90))
+        ]
+        staff = [Staff(business_id=business.id, full_name=f"master-{i}") for i in range(args.staff)]
+        db.add_all(services + staff)
+        await db.flush()
+
+        schedule_rows = []
+        booking_rows = []
+        for member in staff:
+            for offset in range(total_days):
+                day = first_day + timedelta(days=offset)
+                if day.weekday() == 6:
+                    schedule_rows.append(_schedule_row(member.id, ScheduleType.day_off, day, dtime(0), dtime(23, 59)))
+                    continue
+                schedule_rows.append(_schedule_row(member.id, ScheduleType.work, day, dtime(9), dtime(21)))
+                schedule_rows.append(_schedule_row(member.id, ScheduleType.break_time, day, dtime(14), dtime(14, 30)))
+
+                cursor = datetime.combine(day, dtime(9), tzinfo=UTC) - timedelta(hours=3)
+                for _ in range(args.bookings_per_day):
+                    service = rng.choice(services)
+                    cursor += timedelta(minutes=rng.choice((0, 15, 30)))
+                    end = cursor + timedelta(minutes=service.duration_minutes)
+                    booking_rows.append(
+                        {
+                            "business_id": business.id,
+                            "service_id": service.id,
+                            "staff_id": member.id,
+                            "start_at": cursor,
+                            "end_at": end,
+                            "status": rng.choice(SEED_STATUSES) if day < today else BookingStatus.confirmed,
+                            "source": BookingSource.telegram,
+                            "total_price": service.price,
+                        }
+                    )
+                    cursor = end
+
+        await db.execute(insert(Schedule), schedule_rows)
+        for chunk_start in range(0, len(booking_rows), 5000):
+            await db.execute(insert(Booking), booking_rows[chunk_start : chunk_start + 5000])
+
+        dataset["businesses"].append(
+            {"id": business.id, "services": [service.id for service in services], "staff": [member.id for member in staff]}
+        )
+
+    await db.commit()
+    return dataset
+
+
+async def load_dataset(db: AsyncSession) -> dict:
+    businesses = (await db.scalars(select(Business.id).where(Business.name.like("bench-%")).order_by(Business.id))).all()
+    dataset: dict = {"businesses": []}
+    for business_id in businesses:
+        services = (await db.scalars(select(Service.id).where(Service.business_id == business_id))).all()
+        staff = (await db.scalars(select(Staff.id).where(Staff.business_id == business_id))).all()
+        dataset["businesses"].append({"id": business_id, "services": list(services), "staff": list(staff)})
+    return dataset
+
+
+async def pending_booking_ids(db: AsyncSession, limit: int) -> list[int]:
+    return list((await db.scalars(select(Booking.id).where(Booking.status == BookingStatus.pending).limit(limit))).all())
+
+
+def build_scenarios(dataset: dict, booking_ids: list[int], args: argparse.Namespace, rng: random.Random):
+    today = datetime.now(UTC).date()
+    businesses = dataset["businesses"]
+    webhook_ids = iter(booking_ids)
+
+    def pick() -> tuple[dict, int, int, date]:
+        business = rng.choice(businesses)
+        day = today + timedelta(days=rng.randrange(1, args.days))
+        return business, rng.choice(business["services"]), rng.choice(business["staff"]), day
+
+    async def slots(client: AsyncClient) -> Response:
+        business, service_id, staff_id, day = pick()
+        return await client.post(
+            "/api/v1/booking/slots",
+            json={"business_id": business["id"], "service_id": service_id, "staff_id": staff_id, "day": day.isoformat()},
+        )
+
+    async def slots_range(client: AsyncClient) -> Response:
+        business, service_id, staff_id, _ = pick()
+        return await client.post(
+            "/api/v1/booking/slots/range",
+            json={
+                "business_id": business["id"],
+                "service_id": service_id,
+                "staff_id": staff_id,
+                "date_from": (today + timedelta(days=1)).isoformat(),
+                "date_to": (today + timedelta(days=args.range_days)).isoformat(),
+            },
+        )
+
+    async def slots_any(client: AsyncClient) -> Response:
+        business, service_id, _, day = pick()
+        return await client.post(
+            "/api/v1/booking/slots/any",
+            json={"business_id": business["id"], "service_id": service_id, "date_from": day.isoformat(), "date_to": day.isoformat()},
+        )
+
+    async def booking(client: AsyncClient) -> Response:
+        business, service_id, staff_id, day = pick()
+        start = datetime.combine(day, dtime(9), tzinfo=UTC) + timedelta(minutes=15 * rng.randrange(0, 40))
+        return await client.post(
+            "/api/v1/booking",
+            json={"business_id": business["id"], "service_id": service_id, "staff_id": staff_id, "start_at": start.isoformat()},
+        )
+
+    async def webhook(client: AsyncClient) -> Response:
+        booking_id = next(webhook_ids, rng.choice(booking_ids) if booking_ids else 0)
+        payment_id = f"bench-{booking_id}-{rng.getrandbits(48):x}"
+        return await client.post(
+            "/api/v1/webhooks/yookassa",
+            headers={"X-Request-Id": payment_id},
+            json={
+                "event": "payment.succeeded",
+                "object": {
+                    "id": payment_id,
+                    "status": "succeeded",
+                    "amount": {"value": "1500.00", "currency": "RUB"},
+                    "metadata": {"booking_id": str(booking_id)},
+                },
+            },
+        )
+
+    return {"slots": slots, "slots_range": slots_range, "slots_any": slots_any, "booking": booking, "webhook": webhook}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_scenario(
+    name: str,
+    request: Callable[[AsyncClient], Awaitable[Response]],
+    client: AsyncClient,
+    counter: QueryCounter,
+    total: int,
+    concurrency: int,
+) -> dict:
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await request(client)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    queries_before = counter.count
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    report = {
+        "requests": total,
+        "concurrency": concurrency,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "throughput_rps": round(total / elapsed, 2),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies) * 1000, 3),
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+        },
+        "queries_per_request": round((counter.count - queries_before) / total, 2),
+    }
+    print(
+        f"{name:12s} rps={report['throughput_rps']:>9} p50={report['latency_ms']['p50']:>9}ms "
+        f"p95={report['latency_ms']['p95']:>9}ms p99={report['latency_ms']['p99']:>9}ms "
+        f"q/req={report['queries_per_request']:>6} statuses={report['statuses']}",
+        file=sys.stderr,
+    )
+    return report
+
+
+def compare(current: dict, baseline: dict) -> None:
+    for name, report in current["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        deltas = []
+        for key in ("p50", "p95", "p99"):
+            before, after = previous["latency_ms"][key], report["latency_ms"][key]
+            deltas.append(f"{key} {((after - before) / before * 100) if before else 0:+.1f}%")
+        before_rps, after_rps = previous["throughput_rps"], report["throughput_rps"]
+        deltas.append(f"rps {((after_rps - before_rps) / before_rps * 100) if before_rps else 0:+.1f}%")
+        deltas.append(f"q/req {report['queries_per_request'] - previous['queries_per_request']:+.2f}")
+        print(f"{name:12s} " + "  ".join(deltas), file=sys.stderr)
+
+
+async def main(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    settings.slot_cache_enabled = not args.no_slot_cache
+
+    connect_args = {"timeout": 30} if args.database_url.startswith("sqlite") else {}
+    engine = create_async_engine(args.database_url, pool_size=args.concurrency, connect_args=connect_args)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    counter = QueryCounter(engine)
+
+    if args.database_url.startswith("sqlite"):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async with sessions() as db:
+        dataset = await load_dataset(db)
+        if not dataset["businesses"]:
+            started = time.perf_counter()
+            dataset = await seed(db, args, rng)
+            print(f"seeded {len(dataset['businesses'])} businesses in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        booking_ids = await pending_booking_ids(db, args.requests)
+
+    async def override_get_db():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    scenarios = build_scenarios(dataset, booking_ids, args, rng)
+    selected = args.scenarios or list(scenarios)
+
+    results: dict = {
+        "generated_at": datetime.now(UTC).isoformat(),
+        "database": engine.dialect.name,
+        "config": {key: value for key, value in vars(args).items() if key not in {"output", "compare", "database_url"}},
+        "scenarios": {},
+    }
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            for name in selected:
+                if args.warmup:
+                    await run_scenario(name, scenarios[name], client, counter, args.warmup, args.concurrency)
+                results["scenarios"][name] = await run_scenario(
+                    name, scenarios[name], client, counter, args.requests, args.concurrency
+                )
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        await engine.dispose()
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Seed a realistic dataset and load-test booking endpoints in-process")
+    parser.add_argument("--database-url", default=settings.sqlalchemy_database_uri,
+                        help="async SQLAlchemy URL, e.g. sqlite+aiosqlite:///bench.db as a local stand-in")
+    parser.add_argument("--businesses", type=int, default=3)
+    parser.add_argument("--staff", type=int, default=15, help="staff per business")
+    parser.add_argument("--days", type=int, default=30, help="future days with schedules")
+    parser.add_argument("--history-days", type=int, default=180, help="past days with booking history")
+    parser.add_argument("--bookings-per-day", type=int, default=8, help="bookings per staff per working day")
+    parser.add_argument("--range-days", type=int, default=14)
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--scenarios", nargs="*", choices=["slots", "slots_range", "slots_any", "booking", "webhook"])
+    parser.add_argument("--no-slot-cache", action="store_true", help="bypass the Redis slot cache")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=Path, help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", type=Path, help="print deltas against a previous JSON report")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    cli_args = parse_args()
+    report = asyncio.run(main(cli_args))
+    if cli_args.compare:
+        compare(report, json.loads(cli_args.compare.read_text()))
+    if cli_args.output:
+        cli_args.output.write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
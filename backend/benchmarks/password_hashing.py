@@ -0,0 +1,48 @@
+import argparse
+import asyncio
+import time
+
+from app.core.security import hash_password, hash_password_async, pwd_context
+
+
+async def _probe_loop_lag(stop: asyncio.Event, interval: float) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def _burst(logins: int, offload: bool, interval: float) -> tuple[float, float]:
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe_loop_lag(stop, interval))
+    await asyncio.sleep(interval)
+
+    async def login(index: int) -> None:
+        if offload:
+            await hash_password_async(f"password-{index}")
+        else:
+            hash_password(f"password-{index}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login(index) for index in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return elapsed, await probe
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure event loop stalls during a burst of bcrypt logins")
+    parser.add_argument("--logins", type=int, default=16)
+    parser.add_argument("--probe-interval", type=float, default=0.005)
+    args = parser.parse_args()
+
+    print(f"logins={args.logins} bcrypt_rounds={pwd_context.to_dict()['bcrypt__rounds']}")
+    for name, offload in (("inline", False), ("executor", True)):
+        elapsed, worst_lag = asyncio.run(_burst(args.logins, offload, args.probe_interval))
+        print(f"{name:<9} burst {elapsed * 1000:8.1f} ms  worst loop stall {worst_lag * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
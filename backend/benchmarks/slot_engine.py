@@ -0,0 +1,113 @@
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from app.services import occupancy
+from app.services.intervals import Interval
+
+
+def _legacy_slots(
+    work_ranges: list[Interval],
+    blocked_ranges: list[Interval],
+    duration: timedelta,
+    step: timedelta,
+) -> list[Interval]:
+    slots: list[Interval] = []
+    for work_start, work_end in work_ranges:
+        candidate_start = work_start
+        while candidate_start + duration <= work_end:
+            candidate_end = candidate_start + duration
+            if not any(candidate_start < blocked_end and blocked_start < candidate_end for blocked_start, blocked_end in blocked_ranges):
+                slots.append((candidate_start, candidate_end))
+            candidate_start += step
+    return slots
+
+
+def _build_day(work_ranges: list[Interval], blocked_ranges: list[Interval]) -> occupancy.DayOccupancy:
+    day_start = work_ranges[0][0]
+    return occupancy.build(day_start.date(), work_ranges, blocked_ranges, day_start.tzinfo)
+
+
+def _uncached_bitmap_slots(
+    work_ranges: list[Interval],
+    blocked_ranges: list[Interval],
+    duration: timedelta,
+    step: timedelta,
+) -> list[Interval]:
+    day_start = work_ranges[0][0]
+    minute = timedelta(minutes=1)
+    return occupancy.free_slots(
+        _build_day(work_ranges, blocked_ranges), day_start.date(), day_start.tzinfo, duration // minute, step // minute
+    )
+
+
+def _bitmap_slots(encoded: str, day_start: datetime, duration: timedelta, step: timedelta) -> list[Interval]:
+    minute = timedelta(minutes=1)
+    return occupancy.free_slots(occupancy.decode(encoded), day_start.date(), day_start.tzinfo, duration // minute, step // minute)
+
+
+def build_days(days: int, bookings_per_day: int, seed: int) -> list[tuple[list[Interval], list[Interval]]]:
+    rng = random.Random(seed)
+    tz = ZoneInfo("Europe/Moscow")
+    first_day = date(2026, 3, 2)
+    dataset = []
+    for offset in range(days):
+        day_start = datetime.combine(first_day + timedelta(days=offset), datetime.min.time(), tzinfo=tz)
+        work_ranges = [
+            (day_start, day_start + timedelta(hours=14)),
+            (day_start + timedelta(hours=14, minutes=30), day_start + timedelta(hours=23, minutes=55)),
+        ]
+        blocked = [(day_start + timedelta(hours=18), day_start + timedelta(hours=18, minutes=20))]
+        for minute in sorted(rng.sample(range(0, 23 * 60 + 50, 5), bookings_per_day)):
+            start = day_start + timedelta(minutes=minute)
+            blocked.append((start, start + timedelta(minutes=5)))
+        dataset.append((work_ranges, blocked))
+    return dataset
+
+
+def _measure(fn, dataset, duration: timedelta, step: timedelta, repeat: int) -> tuple[float, list[list[Interval]]]:
+    best = float("inf")
+    output: list[list[Interval]] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = [fn(work, blocked, duration, step) for work, blocked in dataset]
+        best = min(best, time.perf_counter() - started)
+    return best, output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare legacy and bitmap slot generation on dense synthetic days")
+    parser.add_argument("--days", type=int, default=28)
+    parser.add_argument("--bookings", type=int, default=220)
+    parser.add_argument("--step", type=int, default=5)
+    parser.add_argument("--duration", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    dataset = build_days(args.days, args.bookings, args.seed)
+    duration = timedelta(minutes=args.duration)
+    step = timedelta(minutes=args.step)
+
+    legacy_time, legacy_output = _measure(_legacy_slots, dataset, duration, step, args.repeat)
+    build_time, build_output = _measure(_uncached_bitmap_slots, dataset, duration, step, args.repeat)
+    if legacy_output != build_output:
+        raise SystemExit("uncached bitmap output differs from legacy implementation")
+
+    bitmaps = [(occupancy.encode(_build_day(work, blocked)), work[0][0]) for work, blocked in dataset]
+    bitmap_time, bitmap_output = _measure(_bitmap_slots, bitmaps, duration, step, args.repeat)
+    if bitmap_output != legacy_output:
+        raise SystemExit("cached bitmap output differs from legacy implementation")
+
+    slots = sum(len(day) for day in legacy_output)
+    print(f"days={args.days} bookings/day={args.bookings} step={args.step}m duration={args.duration}m slots={slots}")
+    print(f"legacy:          {legacy_time * 1000:9.2f} ms")
+    print(f"bitmap uncached: {build_time * 1000:9.2f} ms")
+    print(f"bitmap cached:   {bitmap_time * 1000:9.2f} ms ({sum(len(encoded) for encoded, _ in bitmaps)} bytes encoded)")
+    print(f"speedup:         {legacy_time / build_time:9.1f}x uncached, {legacy_time / bitmap_time:9.1f}x cached")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import gzip
+import time
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.api.responses import FastJSONResponse, day_slots_payload, day_staff_slots_payload
+from app.schemas.booking import DaySlotsOut, DayStaffSlotsOut, SlotFormat, SlotOut, StaffSlotOut
+
+DAY_SLOTS = TypeAdapter(list[DaySlotsOut])
+DAY_STAFF_SLOTS = TypeAdapter(list[DayStaffSlotsOut])
+
+
+def build_slots(days: int, step: int, duration: int, tz: ZoneInfo) -> dict[date, list[tuple[datetime, datetime, list[int]]]]:
+    first_day = date(2026, 3, 2)
+    slots_by_day = {}
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        opening = datetime.combine(day, datetime.min.time(), tzinfo=tz) + timedelta(hours=9)
+        starts = [opening + timedelta(minutes=minute) for minute in range(0, 12 * 60 - duration + 1, step)]
+        slots_by_day[day] = [(start, start + timedelta(minutes=duration), [1, 2, 3]) for start in starts]
+    return slots_by_day
+
+
+def _current(slots_by_day, any_staff: bool) -> bytes:
+    if any_staff:
+        models = [
+            DayStaffSlotsOut(day=day, slots=[StaffSlotOut(start_at=s, end_at=e, staff_ids=ids) for s, e, ids in slots])
+            for day, slots in slots_by_day.items()
+        ]
+        content = DAY_STAFF_SLOTS.dump_python(DAY_STAFF_SLOTS.validate_python(models), mode="json")
+    else:
+        models = [
+            DaySlotsOut(day=day, slots=[SlotOut(start_at=s, end_at=e) for s, e, _ in slots])
+            for day, slots in slots_by_day.items()
+        ]
+        content = DAY_SLOTS.dump_python(DAY_SLOTS.validate_python(models), mode="json")
+    return JSONResponse(content).body
+
+
+def _fast(slots_by_day, any_staff: bool, fmt: SlotFormat, tz: ZoneInfo) -> bytes:
+    if any_staff:
+        content = [day_staff_slots_payload(day, slots, fmt, tz) for day, slots in slots_by_day.items()]
+    else:
+        content = [day_slots_payload(day, [(s, e) for s, e, _ in slots], fmt, tz) for day, slots in slots_by_day.items()]
+    return FastJSONResponse(content).body
+
+
+def _measure(fn, repeat: int) -> tuple[float, bytes]:
+    best, body = float("inf"), b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare slot response encode time and payload size")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--step", type=int, default=5)
+    parser.add_argument("--duration", type=int, default=30)
+    parser.add_argument("--any-staff", action="store_true", help="encode the any-staff response shape")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tz = ZoneInfo("Europe/Moscow")
+    slots_by_day = build_slots(args.days, args.step, args.duration, tz)
+    slots = sum(len(day) for day in slots_by_day.values())
+    print(f"days={args.days} step={args.step}m duration={args.duration}m slots={slots} any_staff={args.any_staff}")
+
+    current_time, current_body = _measure(lambda: _current(slots_by_day, args.any_staff), args.repeat)
+    results = [("pydantic+json", current_time, current_body)]
+    for fmt in SlotFormat:
+        elapsed, body = _measure(lambda: _fast(slots_by_day, args.any_staff, fmt, tz), args.repeat)
+        results.append((f"orjson {fmt.value}", elapsed, body))
+    if results[1][2] != current_body:
+        raise SystemExit("orjson full payload differs from the pydantic response")
+
+    for name, elapsed, body in results:
+        print(
+            f"{name:<15} {elapsed * 1000:8.2f} ms {len(body):9d} bytes {len(gzip.compress(body)):8d} gzipped"
+            f"  {current_time / elapsed:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
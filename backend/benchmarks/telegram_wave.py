@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import time
+from collections import defaultdict, deque
+
+from httpx import ASGITransport
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.services.telegram_bot import DeliveryResult, RateLimiter, TelegramBot
+
+
+class BotApiStub:
+    def __init__(self, global_limit: int, chat_interval: float, latency: float) -> None:
+        self.global_limit = global_limit
+        self.chat_interval = chat_interval
+        self.latency = latency
+        self.recent: deque[float] = deque()
+        self.last_by_chat: dict[int, float] = {}
+        self.delivered: dict[int, int] = defaultdict(int)
+        self.throttled = 0
+        self.app = Starlette(routes=[Route("/bot{token}/sendMessage", self.send_message, methods=["POST"])])
+
+    def _too_many(self, retry_after: int) -> JSONResponse:
+        self.throttled += 1
+        body = {"ok": False, "error_code": 429, "description": "Too Many Requests", "parameters": {"retry_after": retry_after}}
+        return JSONResponse(body, status_code=429)
+
+    async def send_message(self, request: Request) -> JSONResponse:
+        payload = await request.json()
+        chat_id = payload["chat_id"]
+        now = time.monotonic()
+        while self.recent and self.recent[0] <= now - 1:
+            self.recent.popleft()
+        if len(self.recent) >= self.global_limit:
+            return self._too_many(1)
+        if now - self.last_by_chat.get(chat_id, float("-inf")) < self.chat_interval:
+            return self._too_many(1)
+        self.recent.append(now)
+        self.last_by_chat[chat_id] = now
+        await asyncio.sleep(self.latency)
+        self.delivered[chat_id] += 1
+        return JSONResponse({"ok": True, "result": {"chat": {"id": chat_id}, "text": payload["text"]}})
+
+
+async def run(args: argparse.Namespace) -> None:
+    stub = BotApiStub(args.stub_limit, 1 / args.chat_rate, args.latency)
+    bot = TelegramBot(
+        token="bench",
+        base_url="http://telegram-stub",
+        limiter=RateLimiter(args.rate, args.chat_rate),
+        transport=ASGITransport(app=stub.app),
+    )
+    chats = [1_000_000 + index % args.chats for index in range(args.messages)]
+    started = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(bot.send_message(chat_id, f"Reminder #{index}") for index, chat_id in enumerate(chats)))
+    finally:
+        await bot.aclose()
+    elapsed = time.perf_counter() - started
+
+    outcome = {result.value: results.count(result) for result in DeliveryResult}
+    print(f"messages={args.messages} chats={args.chats} rate={args.rate}/s chat_rate={args.chat_rate}/s")
+    print(f"elapsed:    {elapsed:9.2f} s (ideal {args.messages / args.rate:.2f} s)")
+    print(f"throughput: {args.messages / elapsed:9.1f} msg/s")
+    print(f"results:    {outcome}")
+    print(f"stub 429s:  {stub.throttled}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Send a reminder wave through the rate limiter against a local Bot API stub")
+    parser.add_argument("--messages", type=int, default=600)
+    parser.add_argument("--chats", type=int, default=500)
+    parser.add_argument("--rate", type=float, default=30, help="limiter global rate (messages/second)")
+    parser.add_argument("--chat-rate", type=float, default=1, help="limiter per-chat rate (messages/second)")
+    parser.add_argument("--stub-limit", type=int, default=30, help="messages/second the stub accepts before 429")
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated Bot API latency in seconds")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="serve the stub over HTTP instead of running a wave")
+    args = parser.parse_args()
+
+    if args.serve:
+        import uvicorn
+
+        uvicorn.run(BotApiStub(args.stub_limit, 1 / args.chat_rate, args.latency).app, port=args.serve)
+    else:
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
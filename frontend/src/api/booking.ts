@@ -1,5 +1,5 @@
 import { api } from './client';
-import type { Slot } from '@/types';
+import type { DayChainSlots, DaySlots, DayStaffSlots, Slot, SlotDelta, SlotHold } from '@/types';
 
 export async function fetchSlots(payload: {
   business_id: number;
@@ -11,6 +11,73 @@ export async function fetchSlots(payload: {
   return data;
 }
 
+export async function fetchSlotRange(payload: {
+  business_id: number;
+  service_id: number;
+  staff_id: number;
+  date_from: string;
+  date_to: string;
+}) {
+  const { data } = await api.post<DaySlots[]>('/booking/slots/range', payload);
+  return data;
+}
+
+export function subscribeSlotStream(
+  params: {
+    business_id: number;
+    service_id: number;
+    staff_id: number;
+    date_from: string;
+    date_to: string;
+  },
+  handlers: {
+    onSnapshot: (days: DaySlots[]) => void;
+    onDelta: (delta: SlotDelta) => void;
+  },
+) {
+  const query = new URLSearchParams(
+    Object.entries(params).map(([key, value]) => [key, String(value)]),
+  );
+  const source = new EventSource(`${api.defaults.baseURL}/booking/slots/stream?${query}`);
+  source.addEventListener('snapshot', (event) => handlers.onSnapshot(JSON.parse((event as MessageEvent).data)));
+  source.addEventListener('delta', (event) => handlers.onDelta(JSON.parse((event as MessageEvent).data)));
+  return () => source.close();
+}
+
+export async function fetchAnyStaffSlots(payload: {
+  business_id: number;
+  service_id: number;
+  date_from: string;
+  date_to: string;
+}) {
+  const { data } = await api.post<DayStaffSlots[]>('/booking/slots/any', payload);
+  return data;
+}
+
+export async function fetchSlotChains(payload: {
+  business_id: number;
+  date_from: string;
+  date_to: string;
+  steps: { service_id: number; staff_id?: number }[];
+}) {
+  const { data } = await api.post<DayChainSlots[]>('/booking/slots/chain', payload);
+  return data;
+}
+
+export async function createHold(payload: {
+  business_id: number;
+  service_id: number;
+  staff_id: number;
+  start_at: string;
+}) {
+  const { data } = await api.post<SlotHold>('/booking/holds', payload);
+  return data;
+}
+
+export async function releaseHold(token: string, params: { business_id: number; staff_id: number }) {
+  await api.delete(`/booking/holds/${token}`, { params });
+}
+
 export async function createBooking(payload: {
   business_id: number;
   service_id: number;
@@ -18,7 +85,19 @@ export async function createBooking(payload: {
   client_id?: number;
   start_at: string;
   notes?: string;
+  hold_token?: string;
 }) {
   const { data } = await api.post('/booking', payload);
   return data;
 }
+
+export async function createBookingChain(payload: {
+  business_id: number;
+  client_id?: number;
+  start_at: string;
+  notes?: string;
+  steps: { service_id: number; staff_id: number; hold_token?: string }[];
+}) {
+  const { data } = await api.post('/booking/chain', payload);
+  return data;
+}
@@ -1,11 +1,11 @@
-import { useMemo, useState } from 'react';
-import { useMutation, useQuery } from '@tanstack/react-query';
+import { useEffect, useMemo, useState } from 'react';
+import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
 import { motion } from 'framer-motion';
 import { format } from 'date-fns';
-import { createBooking, fetchSlots } from '@/api/booking';
+import { createBooking, createHold, fetchSlots, releaseHold, subscribeSlotStream } from '@/api/booking';
 import { useBookingStore } from '@/store/bookingStore';
 import { useTelegram } from '@/hooks/useTelegram';
-import type { Service, Staff } from '@/types';
+import type { Service, Slot, Staff } from '@/types';
 
 const SERVICES: Service[] = [
   { id: 1, business_id: 1, name: 'Haircut', price: '2500', duration_minutes: 60 },
@@ -19,8 +19,9 @@ const STAFF: Staff[] = [
 
 export default function BookingFlow() {
   const [step, setStep] = useState(0);
-  const { setField, serviceId, staffId, day, slotStart, clientName, phone, reset } = useBookingStore();
+  const { setField, serviceId, staffId, day, slotStart, holdToken, clientName, phone, reset } = useBookingStore();
   const { hapticSuccess, hapticError } = useTelegram();
+  const queryClient = useQueryClient();
 
   const dayValue = day ?? format(new Date(), 'yyyy-MM-dd');
 
@@ -36,6 +37,24 @@ export default function BookingFlow() {
     enabled: Boolean(serviceId && staffId),
   });
 
+  useEffect(() => {
+    if (!serviceId || !staffId) return;
+    const queryKey = ['slots', serviceId, staffId, dayValue];
+    return subscribeSlotStream(
+      { business_id: 1, service_id: serviceId, staff_id: staffId, date_from: dayValue, date_to: dayValue },
+      {
+        onSnapshot: (days) => queryClient.setQueryData(queryKey, days[0]?.slots ?? []),
+        onDelta: (delta) =>
+          queryClient.setQueryData<Slot[]>(queryKey, (slots = []) => {
+            const removed = new Set(delta.removed.map((slot) => slot.start_at));
+            return [...slots.filter((slot) => !removed.has(slot.start_at)), ...delta.added].sort((a, b) =>
+              a.start_at.localeCompare(b.start_at),
+            );
+          }),
+      },
+    );
+  }, [queryClient, serviceId, staffId, dayValue]);
+
   const mutation = useMutation({
     mutationFn: () =>
       createBooking({
@@ -44,15 +63,39 @@ export default function BookingFlow() {
         staff_id: staffId!,
         start_at: slotStart!,
         notes: `Client ${clientName}, phone ${phone}`,
+        hold_token: holdToken,
       }),
     onSuccess: () => {
       hapticSuccess();
+      setField('holdToken', undefined);
       reset();
       setStep(0);
     },
     onError: () => hapticError(),
   });
 
+  const holdMutation = useMutation({
+    mutationFn: (startAt: string) =>
+      createHold({ business_id: 1, service_id: serviceId!, staff_id: staffId!, start_at: startAt }),
+    onSuccess: (hold) => {
+      setField('slotStart', hold.start_at);
+      setField('holdToken', hold.token);
+      setStep(3);
+    },
+    onError: () => {
+      hapticError();
+      slotsQuery.refetch();
+    },
+  });
+
+  const backToSlots = () => {
+    if (holdToken && staffId) {
+      releaseHold(holdToken, { business_id: 1, staff_id: staffId }).catch(() => undefined);
+      setField('holdToken', undefined);
+    }
+    setStep(2);
+  };
+
   const selectedService = useMemo(() => SERVICES.find((item) => item.id === serviceId), [serviceId]);
 
   return (
@@ -109,10 +152,8 @@ export default function BookingFlow() {
               {slotsQuery.data?.map((slot) => (
                 <button
                   key={slot.start_at}
-                  onClick={() => {
-                    setField('slotStart', slot.start_at);
-                    setStep(3);
-                  }}
+                  onClick={() => holdMutation.mutate(slot.start_at)}
+                  disabled={holdMutation.isPending}
                   className="rounded-lg border bg-white p-2 text-sm"
                 >
                   {format(new Date(slot.start_at), 'HH:mm')}
@@ -124,7 +165,7 @@ export default function BookingFlow() {
 
         {step === 3 && (
           <div className="space-y-3">
-            <button className="text-sm text-slate-500" onClick={() => setStep(2)}>← Back</button>
+            <button className="text-sm text-slate-500" onClick={backToSlots}>← Back</button>
             <div className="rounded-xl bg-white p-4 shadow-sm">
               <div className="font-semibold">{selectedService?.name}</div>
               <div className="text-sm text-slate-500">{slotStart ? format(new Date(slotStart), 'dd.MM HH:mm') : '-'}</div>
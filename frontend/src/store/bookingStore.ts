@@ -5,6 +5,7 @@ type BookingState = {
   staffId?: number;
   day?: string;
   slotStart?: string;
+  holdToken?: string;
   clientName: string;
   phone: string;
   setField: <K extends keyof BookingState>(key: K, value: BookingState[K]) => void;
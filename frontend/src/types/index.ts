@@ -18,11 +18,52 @@ export type Slot = {
   end_at: string;
 };
 
+export type DaySlots = {
+  day: string;
+  slots: Slot[];
+};
+
+export type SlotHold = {
+  token: string;
+  staff_id: number;
+  start_at: string;
+  end_at: string;
+  expires_at: string;
+};
+
+export type SlotDelta = {
+  day: string;
+  added: Slot[];
+  removed: Slot[];
+};
+
+export type StaffSlot = Slot & {
+  staff_ids: number[];
+};
+
+export type DayStaffSlots = {
+  day: string;
+  slots: StaffSlot[];
+};
+
+export type ChainLink = StaffSlot & {
+  service_id: number;
+};
+
+export type ChainSlot = Slot & {
+  links: ChainLink[];
+};
+
+export type DayChainSlots = {
+  day: string;
+  chains: ChainSlot[];
+};
+
 export type BookingCard = {
   id: number;
   clientName: string;
   serviceName: string;
   staffName: string;
   startAt: string;
-  status: 'pending' | 'confirmed' | 'paid' | 'no_show' | 'completed';
+  status: 'pending' | 'confirmed' | 'paid' | 'no_show' | 'completed' | 'expired';
 };